@@ -37,7 +37,7 @@ def answer_with_rewrites(
                 generator,
                 top_k_ctx=top_k_ctx,
             )
-            d = payload.dict()
+            d = payload.model_dump()
             d["_rewrite"] = q
             attempts.append(d)
 
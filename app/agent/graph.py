@@ -1,6 +1,8 @@
 # app/agent/graph.py
 from __future__ import annotations
-from typing import Dict, Any
+from functools import lru_cache
+from typing import Dict, Any, Optional, Tuple
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import StateGraph, END
 
 from app.agent.types import AgentState
@@ -18,36 +20,46 @@ from app.tools.web_search import perform_web_search
 import os
 from dotenv import load_dotenv
 
-# --- Init shared components ---
 load_dotenv()
 
-embedder = Embedder(model_name="BAAI/bge-small-en-v1.5")
-_SEARCHER = FaissSqliteSearcher(embedder)
+# --- Shared components ---
+# Passed per run through config["configurable"] so the API reuses the searcher and
+# generator its lifespan built; importing this module loads no models.
+@lru_cache(maxsize=1)
+def default_components() -> Tuple[FaissSqliteSearcher, GroqGenerator]:
+    """Searcher and generator for callers that bring none (CLI); built on first use."""
+    embedder = Embedder(model_name="BAAI/bge-small-en-v1.5")
+    searcher = FaissSqliteSearcher(embedder)
+    generator = GroqGenerator(model="llama-3.1-8b-instant", api_key=os.getenv("GROQ_API_KEY"))
+    return searcher, generator
 
-llm_api_key = os.getenv("GROQ_API_KEY")
-_GEN = GroqGenerator(model="llama-3.1-8b-instant", api_key=llm_api_key)
+def _searcher(config: RunnableConfig) -> FaissSqliteSearcher:
+    return config["configurable"]["searcher"]
+
+def _gen(config: RunnableConfig) -> GroqGenerator:
+    return config["configurable"]["generator"]
 
 # --- Nodes ---
-def node_router(state: AgentState) -> AgentState:
-    intent = route(state["question"], allow_llm_fallback=False, generator=_GEN)
+def node_router(state: AgentState, config: RunnableConfig) -> AgentState:
+    intent = route(state["question"], allow_llm_fallback=False, generator=_gen(config))
     state["intent"] = intent
     state.setdefault("trace", []).append({"node": "router", "intent": intent})
     return state
 
-def node_research(state: AgentState) -> AgentState:
+def node_research(state: AgentState, config: RunnableConfig) -> AgentState:
     if state.get("intent") != "rag":
         state["rewrites"] = []
         state.setdefault("trace", []).append({"node": "researcher", "skipped": True})
         return state
-    rw = make_rewrites(state["question"], max_rewrites=1, generator=_GEN)
+    rw = make_rewrites(state["question"], max_rewrites=1, generator=_gen(config))
     state["rewrites"] = rw
     state.setdefault("trace", []).append({"node": "researcher", "rewrites": rw})
     return state
 
-def node_answer(state: AgentState) -> AgentState:
+def node_answer(state: AgentState, config: RunnableConfig) -> AgentState:
     if state.get("intent") == "chitchat":
         # direct LLM, no context
-        out = _GEN.generate(
+        out = _gen(config).generate(
             prompt=state["question"],
             contexts=[],
             system=(
@@ -69,8 +81,8 @@ def node_answer(state: AgentState) -> AgentState:
         bundle = answer_with_rewrites(
             state["question"],
             state.get("rewrites", []),
-            searcher=_SEARCHER,
-            generator=_GEN,
+            searcher=_searcher(config),
+            generator=_gen(config),
             top_k_ctx=8,
             confidence_gate=0.65,
             mode="merge"
@@ -96,7 +108,7 @@ def node_compliance(state: AgentState) -> AgentState:
     state.setdefault("trace", []).append({"node": "compliance", "blocked": state["best"]["safety"]["blocked"]})
     return state
 
-def node_web_search(state: AgentState) -> AgentState:
+def node_web_search(state: AgentState, config: RunnableConfig) -> AgentState:
     q = state["question"]
 
     results = perform_web_search(q, num_results=3)
@@ -112,7 +124,7 @@ def node_web_search(state: AgentState) -> AgentState:
 
     # Otherwise continue as normal
     ctx = "\n".join([f"{r['title']}: {r['snippet']}" for r in results])
-    summary = _GEN.generate(
+    summary = _gen(config).generate(
         prompt=f"Summarize the key points from these results about '{q}'.",
         contexts=[ctx],
         system="Factual assistant. Stay grounded in provided snippets. Include URLs."
@@ -160,8 +172,16 @@ def build_graph():
 
 
 # --- Runner ---
-def run_agent(question: str) -> Dict[str, Any]:
+def run_agent(
+    question: str,
+    searcher: Optional[FaissSqliteSearcher] = None,
+    generator: Optional[GroqGenerator] = None,
+) -> Dict[str, Any]:
+    if searcher is None or generator is None:
+        default_searcher, default_generator = default_components()
+        searcher = searcher or default_searcher
+        generator = generator or default_generator
     app = build_graph()
     state: AgentState = {"question": question}
-    final = app.invoke(state)
+    final = app.invoke(state, config={"configurable": {"searcher": searcher, "generator": generator}})
     return {"final": final.get("best"), "trace": final.get("trace", [])}
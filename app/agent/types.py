@@ -119,8 +119,8 @@ class AgentState(TypedDict, total=False):
     question: str
     intent: Optional[Intent]
     rewrites: List[str]
-    answers: List[Dict[str, Any]]  # List of AnswerPayload.dict()
-    best: Optional[Dict[str, Any]]  # Chosen AnswerPayload.dict()
+    answers: List[Dict[str, Any]]  # List of AnswerPayload.model_dump()
+    best: Optional[Dict[str, Any]]  # Chosen AnswerPayload.model_dump()
     trace: List[TraceEntry]
     web_results: Optional[List[Dict[str, Any]]]
     status: Optional[ProcessingStatus]
@@ -1,10 +1,17 @@
 # app/api.py
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from dotenv import load_dotenv
 import os
 import json
 
+try:  # optional C parser for the model's JSON answers; same dicts as json.loads
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
 from app.llm.groq_gen import GroqGenerator
 from app.retrieval.faiss_sqlite import FaissSqliteSearcher
 from app.qa.answer import answer_question
@@ -20,8 +27,21 @@ from app.embed.model import Embedder
 # 👇 memory functions
 from app.memory.store import save_message, get_recent_messages
 
+load_dotenv()
+
+# --- Components ---
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Heavy components are built once per worker at startup rather than at
+    # import time; the FAISS index is mmap'd so workers share its pages.
+    embedder = Embedder(model_name="BAAI/bge-small-en-v1.5")
+    app.state.searcher = FaissSqliteSearcher(embedder, db_path="rag_local.db")
+    app.state.gen = GroqGenerator(model="llama-3.1-8b-instant", api_key=os.getenv("GROQ_API_KEY"))
+    yield
+    await app.state.gen.aclose()
+
 # --- FastAPI App ---
-app = FastAPI(title="RAG-Agentic-AI")
+app = FastAPI(title="RAG-Agentic-AI", lifespan=lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # dev/demo only
@@ -36,15 +56,6 @@ app.add_middleware(ObservabilityMiddleware)
 # expose /metrics (Prometheus text format)
 app.mount("/metrics", make_asgi_app())
 
-load_dotenv()
-
-# --- Components ---
-embedder = Embedder(model_name="BAAI/bge-small-en-v1.5")
-_searcher = FaissSqliteSearcher(embedder, db_path="rag_local.db")
-
-llm_api_key = os.getenv("GROQ_API_KEY")
-_gen = GroqGenerator(model="llama-3.1-8b-instant", api_key=llm_api_key)
-
 # --- Request Models ---
 class ChatReq(BaseModel):
     prompt: str
@@ -72,17 +83,23 @@ def health():
     return {"ok": True}
 
 @app.post("/chat", response_model=ChatResp)
-def chat(req: ChatReq):
-    text = _gen.generate(req.prompt, system="You are a fast assistant.")
+async def chat(req: ChatReq, request: Request):
+    text = await request.app.state.gen.agenerate(req.prompt, system="You are a fast assistant.")
     return ChatResp(output=text)
 
+@app.post("/chat/stream")
+async def chat_stream(req: ChatReq, request: Request):
+    # first tokens reach the client while the rest are still being generated
+    deltas = request.app.state.gen.astream(req.prompt, system="You are a fast assistant.")
+    return StreamingResponse(deltas, media_type="text/plain; charset=utf-8")
+
 @app.post("/search")
-def search(req: SearchReq):
-    hits = _searcher.search(req.query, top_k=req.top_k)
+def search(req: SearchReq, request: Request):
+    hits = request.app.state.searcher.search(req.query, top_k=req.top_k)
     return {"hits": hits}
 
 @app.post("/ask")
-def ask(req: AskReq):
+def ask(req: AskReq, request: Request):
     # --- Fetch conversation history ---
     history = get_recent_messages(req.session_id, limit=5)
     history_text = "\n".join([f"{m['role']}: {m['content']}" for m in history])
@@ -93,8 +110,8 @@ def ask(req: AskReq):
     # --- Run RAG QA ---
     payload = answer_question(
         user_input,   # 👈 enriched with history
-        _searcher,
-        _gen,
+        request.app.state.searcher,
+        request.app.state.gen,
         top_k_ctx=req.top_k_ctx,
     )
 
@@ -102,14 +119,14 @@ def ask(req: AskReq):
     save_message(req.session_id, "user", req.question)
     save_message(req.session_id, "assistant", payload.answer)
 
-    answer_dict = json.loads(payload.dict()['answer'])
+    answer_dict = _json_loads(payload.answer)
 
     return answer_dict["answer"]
-    # return payload.dict()
+    # return payload.model_dump()
     
 
 @app.post("/agent/ask")
-def agent_ask(req: AgentAskReq):
+def agent_ask(req: AgentAskReq, request: Request):
     # --- Fetch conversation history ---
     history = get_recent_messages("agent_" + req.session_id, limit=5)
     history_text = "\n".join([f"{m['role']}: {m['content']}" for m in history])
@@ -118,7 +135,7 @@ def agent_ask(req: AgentAskReq):
     enriched_q = f"{history_text}\nUser: {req.question}" if history_text else req.question
 
     # --- Run agent ---
-    out = run_agent(enriched_q)
+    out = run_agent(enriched_q, searcher=request.app.state.searcher, generator=request.app.state.gen)
 
     # --- Save memory ---
     save_message("agent_" + req.session_id, "user", req.question)
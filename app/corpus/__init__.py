@@ -19,19 +19,26 @@ Main components:
 
 from .files import (
     iter_paths,
+    iter_paths_parallel,
+    ScandirFileIterator,
     file_sha256,
     sniff_mime,
-    read_text_any
+    read_text_any,
+    file_ext,
+    FileEntry,
+    iter_pages_any
 )
 from .clean import (
     normalize_text,
+    normalize_text_stream,
     clean_whitespace,
     remove_control_characters
 )
 from .chunk import (
     chunk_text,
     split_by_headings,
-    sliding_window_chunks
+    sliding_window_chunks,
+    sliding_window_chunks_soa
 )
 from .schema import (
     connect,
@@ -61,12 +68,18 @@ from .interfaces import (
 __all__ = [
     # File processing
     "iter_paths",
+    "iter_paths_parallel",
+    "ScandirFileIterator",
     "file_sha256", 
     "sniff_mime",
     "read_text_any",
+    "file_ext",
+    "FileEntry",
+    "iter_pages_any",
     
     # Text cleaning
     "normalize_text",
+    "normalize_text_stream",
     "clean_whitespace",
     "remove_control_characters",
     
@@ -74,6 +87,7 @@ __all__ = [
     "chunk_text",
     "split_by_headings",
     "sliding_window_chunks",
+    "sliding_window_chunks_soa",
     
     # Database operations
     "connect",
@@ -11,7 +11,7 @@ This module provides functions for:
 import re
 import hashlib
 import logging
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Tuple, Any
 
 from .interfaces import TextChunker, ChunkData
 
@@ -36,14 +36,7 @@ def _hash_id(text: str) -> str:
     Returns:
         Hexadecimal hash string (truncated to default length)
     """
-    try:
-        hash_value = hashlib.sha256(text.encode("utf-8")).hexdigest()[:DEFAULT_HASH_LENGTH]
-        logger.debug(f"Generated hash ID: {hash_value[:8]}...")
-        return hash_value
-    except Exception as e:
-        logger.error(f"Hash generation failed: {e}")
-        # Fallback to simple hash
-        return str(hash(text))[:DEFAULT_HASH_LENGTH]
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:DEFAULT_HASH_LENGTH]
 
 def split_by_headings(text: str) -> List[Dict[str, Optional[str]]]:
     """
@@ -65,41 +58,32 @@ def split_by_headings(text: str) -> List[Dict[str, Optional[str]]]:
         logger.warning("Empty text provided for heading segmentation")
         return [{"section_title": None, "start": 0, "end": 0}]
     
-    try:
-        sections = []
-        matches = list(HEADING_PATTERN.finditer(text))
-        
-        if not matches:
-            logger.debug("No headings found, treating as single section")
-            return [{"section_title": None, "start": 0, "end": len(text)}]
-        
-        logger.debug(f"Found {len(matches)} headings in text")
-        
-        for i, match in enumerate(matches):
-            start = match.start()
-            # Determine end position
-            if i + 1 < len(matches):
-                end = matches[i + 1].start()
-            else:
-                end = len(text)
-            
-            # Clean up heading text
-            heading_text = match.group(1).strip("# ").strip()
-            
-            sections.append({
-                "section_title": heading_text,
-                "start": start,
-                "end": end
-            })
-            
-            logger.debug(f"Section {i + 1}: '{heading_text}' ({start}-{end})")
+    sections = []
+    matches = list(HEADING_PATTERN.finditer(text))
+    
+    if not matches:
+        logger.debug("No headings found, treating as single section")
+        return [{"section_title": None, "start": 0, "end": len(text)}]
+    
+    for i, match in enumerate(matches):
+        start = match.start()
+        # Determine end position
+        if i + 1 < len(matches):
+            end = matches[i + 1].start()
+        else:
+            end = len(text)
         
-        return sections
+        # Clean up heading text
+        heading_text = match.group(1).strip("# ").strip()
         
-    except Exception as e:
-        logger.error(f"Heading segmentation failed: {e}")
-        # Fallback to single section
-        return [{"section_title": None, "start": 0, "end": len(text)}]
+        sections.append({
+            "section_title": heading_text,
+            "start": start,
+            "end": end
+        })
+    
+    logger.debug("Found %d headings in text", len(matches))
+    return sections
 
 def sliding_window_chunks(
     text: str, 
@@ -117,7 +101,7 @@ def sliding_window_chunks(
         overlap: Number of characters to overlap between chunks
         
     Returns:
-        List of chunk dictionaries
+        List of ChunkData windows
         
     Raises:
         ValueError: If parameters are invalid
@@ -139,38 +123,22 @@ def sliding_window_chunks(
         logger.warning("Empty text provided for chunking")
         return []
     
-    try:
-        chunks = []
-        i = 0
-        chunk_count = 0
-        
-        while i < len(text):
-            j = min(len(text), i + max_chars)
-            chunk_text = text[i:j]
-            
-            if chunk_text.strip():
-                chunk_data = {
-                    "text": chunk_text,
-                    "start_char": i,
-                    "end_char": j,
-                    "section": section
-                }
-                chunks.append(chunk_data)
-                chunk_count += 1
-                logger.debug(f"Created chunk {chunk_count}: {i}-{j} chars")
-            
-            if j >= len(text):
-                break
-                
-            # Move to next position with overlap
-            i = max(0, j - overlap)
-        
-        logger.info(f"Created {chunk_count} chunks from text ({len(text)} chars)")
-        return chunks
+    chunks = []
+    n = len(text)
+    stride = max_chars - overlap
+    # Closed-form window count: the last window is the first one reaching n
+    n_chunks = 1 if n <= max_chars else 1 + (n - max_chars + stride - 1) // stride
+    
+    for k in range(n_chunks):
+        i = k * stride
+        j = min(n, i + max_chars)
+        chunk_text = text[i:j]
         
-    except Exception as e:
-        logger.error(f"Sliding window chunking failed: {e}")
-        raise
+        if chunk_text.strip():
+            chunks.append(ChunkData(chunk_text, i, j, section))
+    
+    logger.debug("Created %d chunks from text (%d chars)", len(chunks), n)
+    return chunks
 
 
 def chunk_text(
@@ -189,7 +157,7 @@ def chunk_text(
         overlap: Number of characters to overlap between chunks
         
     Returns:
-        List of chunk dictionaries with text, positions, and metadata
+        List of ChunkData windows with text, positions, and section
         
     Raises:
         TypeError: If input is not a string
@@ -202,35 +170,63 @@ def chunk_text(
         logger.warning("Empty text provided for chunking")
         return []
     
-    try:
-        all_chunks = []
-        
-        if heading_aware:
-            logger.debug("Using heading-aware chunking")
-            sections = split_by_headings(text)
-            
-            for section_idx, section in enumerate(sections):
-                section_text = text[section["start"]:section["end"]]
-                section_chunks = sliding_window_chunks(
-                    section_text,
-                    section["section_title"],
-                    max_chars=max_chars,
-                    overlap=overlap
-                )
-                all_chunks.extend(section_chunks)
-                logger.debug(f"Section '{section['section_title']}': {len(section_chunks)} chunks")
-        else:
-            logger.debug("Using simple sliding window chunking")
-            all_chunks = sliding_window_chunks(
-                text, 
-                None, 
-                max_chars=max_chars, 
+    all_chunks = []
+    
+    if heading_aware:
+        logger.debug("Using heading-aware chunking")
+        sections = split_by_headings(text)
+        debug = logger.isEnabledFor(logging.DEBUG)
+        
+        for section in sections:
+            section_text = text[section["start"]:section["end"]]
+            section_chunks = sliding_window_chunks(
+                section_text,
+                section["section_title"],
+                max_chars=max_chars,
                 overlap=overlap
             )
+            all_chunks.extend(section_chunks)
+            if debug:
+                logger.debug(f"Section '{section['section_title']}': {len(section_chunks)} chunks")
+    else:
+        logger.debug("Using simple sliding window chunking")
+        all_chunks = sliding_window_chunks(
+            text, 
+            None, 
+            max_chars=max_chars, 
+            overlap=overlap
+        )
+    
+    logger.info("Text chunking completed: %d total chunks", len(all_chunks))
+    return all_chunks
+
+
+def sliding_window_chunks_soa(
+    text: str,
+    section: Optional[str] = None,
+    max_chars: int = DEFAULT_MAX_CHARS,
+    overlap: int = DEFAULT_OVERLAP
+) -> Dict[str, List[Any]]:
+    """
+    Columnar (structure-of-arrays) variant of sliding_window_chunks.
+    
+    Returns one list per field instead of one object per chunk, so batch
+    consumers can hand ``soa["text"]`` straight to an encoder.
+    
+    Args:
+        text: Text to chunk
+        section: Section title for the chunks
+        max_chars: Maximum characters per chunk
+        overlap: Number of characters to overlap between chunks
         
-        logger.info(f"Text chunking completed: {len(all_chunks)} total chunks")
-        return all_chunks
-        
-    except Exception as e:
-        logger.error(f"Text chunking failed: {e}")
-        raise
+    Returns:
+        Dictionary with parallel ``text``, ``start_char``, ``end_char`` and
+        ``section`` lists
+    """
+    chunks = sliding_window_chunks(text, section, max_chars=max_chars, overlap=overlap)
+    return {
+        "text": [c.text for c in chunks],
+        "start_char": [c.start_char for c in chunks],
+        "end_char": [c.end_char for c in chunks],
+        "section": [c.section for c in chunks],
+    }
@@ -9,7 +9,7 @@ This module provides functions for:
 """
 import re
 import logging
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 
 from .interfaces import TextCleaner
 
@@ -49,39 +49,59 @@ def normalize_text(text: str) -> str:
         logger.debug("Empty text provided for normalization")
         return ""
     
-    try:
-        # Step 1: Normalize line endings and remove BOM
-        normalized = text.replace("\r\n", "\n").replace("\r", "\n").replace("\ufeff", "")
-        logger.debug("Normalized line endings and removed BOM")
-        
-        # Step 2: Remove control characters (except newlines and tabs)
-        normalized = _CONTROL_CHARS_PATTERN.sub("", normalized)
-        logger.debug("Removed control characters")
-        
-        # Step 3: Collapse excessive inline whitespace
-        normalized = _WHITESPACE_PATTERN.sub(" ", normalized)
-        logger.debug("Collapsed excessive whitespace")
-        
-        # Step 4: Trim lines and remove completely empty lines
-        lines = [line.strip() for line in normalized.split("\n")]
-        lines = [line for line in lines if line]  # Remove empty lines
-        normalized = "\n".join(lines)
-        logger.debug("Trimmed lines and removed empty lines")
-        
-        # Step 5: Collapse multiple newlines to double newlines
-        normalized = _MULTI_NEWLINE_PATTERN.sub("\n\n", normalized)
-        logger.debug("Collapsed multiple newlines")
-        
-        # Final trim
-        result = normalized.strip()
-        
-        logger.info(f"Text normalization completed: {len(text)} -> {len(result)} characters")
-        return result
+    result = _normalize(text)
+    
+    logger.debug("Text normalization completed: %d -> %d characters", len(text), len(result))
+    return result
+
+
+def normalize_text_stream(pages: Iterable[str]) -> Iterator[str]:
+    """
+    Normalize text page by page.
+    
+    "".join(normalize_text_stream(pages)) equals normalize_text("\\n".join(pages)):
+    normalized output is the non-empty stripped lines joined by newlines, so
+    cleaning each page separately and rejoining non-empty pages with a newline
+    gives the same text without holding the raw and cleaned document at once.
+    
+    Args:
+        pages: Iterable of raw page texts
         
-    except Exception as e:
-        logger.error(f"Text normalization failed: {e}")
-        # Return original text if normalization fails
-        return text.strip()
+    Yields:
+        Cleaned page texts and the newline separators between them
+    """
+    first = True
+    for page in pages:
+        cleaned = _normalize(page)
+        if not cleaned:
+            continue
+        if not first:
+            yield "\n"
+        first = False
+        yield cleaned
+
+
+def _normalize(text: str) -> str:
+    """Normalization steps shared by normalize_text and normalize_text_stream."""
+    # Step 1: Normalize line endings and remove BOM
+    normalized = text.replace("\r\n", "\n").replace("\r", "\n").replace("\ufeff", "")
+    
+    # Step 2: Remove control characters (except newlines and tabs)
+    normalized = _CONTROL_CHARS_PATTERN.sub("", normalized)
+    
+    # Step 3: Collapse excessive inline whitespace
+    normalized = _WHITESPACE_PATTERN.sub(" ", normalized)
+    
+    # Step 4: Trim lines and remove completely empty lines
+    lines = [line.strip() for line in normalized.split("\n")]
+    lines = [line for line in lines if line]  # Remove empty lines
+    normalized = "\n".join(lines)
+    
+    # Step 5: Collapse multiple newlines to double newlines
+    normalized = _MULTI_NEWLINE_PATTERN.sub("\n\n", normalized)
+    
+    # Final trim
+    return normalized.strip()
 
 
 def clean_whitespace(text: str, preserve_structure: bool = True) -> str:
@@ -98,23 +118,12 @@ def clean_whitespace(text: str, preserve_structure: bool = True) -> str:
     if not text:
         return ""
     
-    try:
-        if preserve_structure:
-            # Preserve paragraph structure
-            lines = text.split("\n")
-            cleaned_lines = []
-            for line in lines:
-                # Clean each line but preserve empty lines
-                cleaned_line = _EXTRA_SPACES_PATTERN.sub(" ", line.strip())
-                cleaned_lines.append(cleaned_line)
-            return "\n".join(cleaned_lines)
-        else:
-            # Aggressive whitespace cleaning
-            return _EXTRA_SPACES_PATTERN.sub(" ", text.strip())
-            
-    except Exception as e:
-        logger.error(f"Whitespace cleaning failed: {e}")
-        return text
+    if preserve_structure:
+        # Preserve paragraph structure: clean each line but keep empty lines
+        return "\n".join(_EXTRA_SPACES_PATTERN.sub(" ", line.strip()) for line in text.split("\n"))
+    
+    # Aggressive whitespace cleaning
+    return _EXTRA_SPACES_PATTERN.sub(" ", text.strip())
 
 
 def remove_control_characters(text: str) -> str:
@@ -130,10 +139,5 @@ def remove_control_characters(text: str) -> str:
     if not text:
         return ""
     
-    try:
-        cleaned = _CONTROL_CHARS_PATTERN.sub("", text)
-        logger.debug(f"Removed control characters: {len(text)} -> {len(cleaned)} characters")
-        return cleaned
-    except Exception as e:
-        logger.error(f"Control character removal failed: {e}")
-        return text
+    return _CONTROL_CHARS_PATTERN.sub("", text)
+
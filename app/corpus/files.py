@@ -10,9 +10,14 @@ This module provides functions for:
 """
 import os
 import mimetypes
+import mmap
 import hashlib
+import io
 import logging
-from typing import Iterator, Tuple, Set, Optional
+import atexit
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Iterator, Tuple, FrozenSet, Optional, List, NamedTuple
 from pathlib import Path
 
 from .interfaces import FileIterator, DocumentProcessor, FileMetadata
@@ -20,51 +25,85 @@ from .interfaces import FileIterator, DocumentProcessor, FileMetadata
 logger = logging.getLogger(__name__)
 
 # Configuration constants
-SUPPORTED_EXTENSIONS: Set[str] = {".pdf", ".txt", ".md"}
+SUPPORTED_EXTENSIONS: FrozenSet[str] = frozenset({".pdf", ".txt", ".md"})
 DEFAULT_CHUNK_SIZE = 1 << 20  # 1MB chunks for file reading
+MMAP_THRESHOLD = 4 << 20  # hash files above 4MB through mmap instead of read()
 DEFAULT_ENCODING = "utf-8"
 DEFAULT_ERROR_HANDLING = "ignore"
+DEFAULT_PDF_BACKEND = "pymupdf"  # override with PDF_BACKEND=pdfplumber
+PDF_PARALLEL_MIN_PAGES = 32  # split larger PDFs across page workers (when page_workers > 1)
 
-def iter_paths(root: str) -> Iterator[str]:
+# MIME types for the supported extensions; anything else goes through mimetypes
+_MIME_BY_EXT = {
+    ".pdf": "application/pdf",
+    ".md": "text/markdown",
+    ".txt": "text/plain",
+}
+
+
+def file_ext(path: str) -> str:
+    """
+    Return the lowercased extension of a path, including the dot.
+    
+    Same result as os.path.splitext(path)[1].lower() (a leading dot in the
+    name is not an extension) without building the (root, ext) tuple.
+    
+    Args:
+        path: File path or bare file name
+        
+    Returns:
+        Extension such as ".pdf", or "" if there is none
+    """
+    name = os.path.basename(path)
+    i = name.rfind(".")
+    return name[i:].lower() if i > 0 else ""
+
+
+class FileEntry(NamedTuple):
+    """A supported file found by iter_paths, with the stat fields ingestion needs."""
+    path: str
+    ext: str
+    size: int
+    mtime: float
+
+
+def iter_paths(root: str) -> Iterator[FileEntry]:
     """
     Iterate over supported files in a directory or return single file.
     
+    The extension is parsed and the file stat'ed once here so downstream
+    steps (MIME lookup, reader dispatch, hash cache) never redo it.
+    
     Args:
         root: Root directory path or single file path
         
     Yields:
-        Paths to supported files
+        FileEntry for each supported file
         
     Raises:
-        FileNotFoundError: If root path doesn't exist
-        PermissionError: If access to path is denied
+        FileNotFoundError: If root path doesn't exist (from os.scandir)
+        PermissionError: If access to root is denied (from os.scandir);
+            unreadable subdirectories are logged and skipped, like os.walk
     """
-    if not os.path.exists(root):
-        raise FileNotFoundError(f"Path does not exist: {root}")
-    
-    if not os.access(root, os.R_OK):
-        raise PermissionError(f"Permission denied: {root}")
-    
     if os.path.isfile(root):
-        ext = os.path.splitext(root)[1].lower()
+        ext = file_ext(root)
         if ext in SUPPORTED_EXTENSIONS:
             logger.debug(f"Found supported file: {root}")
-            yield root
+            st = os.stat(root)
+            yield FileEntry(root, ext, st.st_size, st.st_mtime)
         else:
             logger.warning(f"Unsupported file type: {root} (extension: {ext})")
         return
     
+    # Explicit stack over os.scandir: DirEntry caches the d_type from readdir,
+    # so is_dir() needs no extra stat per entry (os.walk lists and then stats).
     try:
-        for dirpath, _, filenames in os.walk(root):
-            for name in filenames:
-                file_path = os.path.join(dirpath, name)
-                ext = os.path.splitext(name)[1].lower()
-                
-                if ext in SUPPORTED_EXTENSIONS:
-                    logger.debug(f"Found supported file: {file_path}")
-                    yield file_path
-                else:
-                    logger.debug(f"Skipping unsupported file: {file_path} (extension: {ext})")
+        stack = [root]
+        while stack:
+            path = stack.pop()
+            files, subdirs = _scan_dir(path, is_root=path == root)
+            stack.extend(subdirs)
+            yield from files
                     
     except PermissionError as e:
         logger.error(f"Permission denied accessing directory {root}: {e}")
@@ -73,6 +112,96 @@ def iter_paths(root: str) -> Iterator[str]:
         logger.error(f"Error iterating over files in {root}: {e}")
         raise
 
+def iter_paths_parallel(root: str, workers: int = 4) -> Iterator[FileEntry]:
+    """
+    Like iter_paths, but scans directories concurrently on a thread pool.
+    
+    os.scandir releases the GIL, so several directory listings can be in
+    flight at once, which raises I/O queue depth on NFS and SSDs. Files are
+    yielded as each directory finishes, so order is not deterministic.
+    
+    Args:
+        root: Root directory path or single file path
+        workers: Number of scanning threads (1 falls back to iter_paths)
+        
+    Yields:
+        FileEntry for each supported file
+        
+    Raises:
+        FileNotFoundError: If root path doesn't exist (from os.scandir)
+        PermissionError: If access to root is denied (from os.scandir);
+            unreadable subdirectories are logged and skipped
+    """
+    if workers <= 1 or os.path.isfile(root):
+        yield from iter_paths(root)
+        return
+    
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = {executor.submit(_scan_dir, root, True)}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    files, subdirs = future.result()
+                    pending.update(executor.submit(_scan_dir, d) for d in subdirs)
+                    yield from files
+    
+    except PermissionError as e:
+        logger.error(f"Permission denied accessing directory {root}: {e}")
+        raise
+    except Exception as e:
+        logger.error(f"Error iterating over files in {root}: {e}")
+        raise
+
+
+class ScandirFileIterator(FileIterator):
+    """FileIterator over iter_paths: one os.scandir per directory, no per-entry stat for subdirectories."""
+    
+    def __init__(self, workers: int = 1):
+        self.workers = workers
+    
+    def iterate_files(self, root_path: str) -> Iterator[str]:
+        """
+        Iterate over supported files in a directory.
+        
+        Args:
+            root_path: Root directory or file path
+            
+        Yields:
+            Paths to supported files
+        """
+        for entry in iter_paths_parallel(root_path, self.workers):
+            yield entry.path
+
+
+def _scan_dir(path: str, is_root: bool = False) -> Tuple[List[FileEntry], List[str]]:
+    """
+    List one directory: supported files as FileEntry, plus subdirectory paths.
+    
+    A subdirectory that cannot be listed (permissions, removed mid-walk) is
+    logged and treated as empty, as os.walk does; errors on the root propagate.
+    """
+    files = []
+    subdirs = []
+    try:
+        it = os.scandir(path)
+    except OSError as e:
+        if is_root:
+            raise
+        logger.error(f"Skipping unreadable directory {path}: {e}")
+        return files, subdirs
+    with it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.path)
+                continue
+            ext = file_ext(entry.name)
+            if ext in SUPPORTED_EXTENSIONS and entry.is_file():
+                st = entry.stat()
+                files.append(FileEntry(entry.path, ext, st.st_size, st.st_mtime))
+    return files, subdirs
+
+
 def file_sha256(path: str) -> str:
     """
     Compute SHA256 hash of a file.
@@ -84,21 +213,24 @@ def file_sha256(path: str) -> str:
         SHA256 hash as hexadecimal string
         
     Raises:
-        FileNotFoundError: If file doesn't exist
-        PermissionError: If file cannot be read
+        FileNotFoundError: If file doesn't exist (from open)
+        PermissionError: If file cannot be read (from open)
         OSError: If file reading fails
     """
-    if not os.path.exists(path):
-        raise FileNotFoundError(f"File not found: {path}")
-    
-    if not os.access(path, os.R_OK):
-        raise PermissionError(f"Cannot read file: {path}")
-    
     try:
         hasher = hashlib.sha256()
-        with open(path, "rb") as f:
-            for chunk in iter(lambda: f.read(DEFAULT_CHUNK_SIZE), b""):
-                hasher.update(chunk)
+        with open(path, "rb", buffering=0) as f:
+            if os.fstat(f.fileno()).st_size > MMAP_THRESHOLD:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    if hasattr(mm, "madvise"):
+                        mm.madvise(mmap.MADV_SEQUENTIAL)
+                    hasher.update(mm)
+            else:
+                # Reuse one buffer: readinto avoids allocating a bytes object per chunk
+                buf = bytearray(DEFAULT_CHUNK_SIZE)
+                view = memoryview(buf)
+                while n := f.readinto(buf):
+                    hasher.update(view[:n])
         
         hash_value = hasher.hexdigest()
         logger.debug(f"Computed SHA256 for {path}: {hash_value[:16]}...")
@@ -109,25 +241,24 @@ def file_sha256(path: str) -> str:
         raise
 
 
-def sniff_mime(path: str) -> str:
+def sniff_mime(path: str, ext: Optional[str] = None) -> str:
     """
     Detect MIME type of a file based on extension.
     
     Args:
         path: Path to the file
+        ext: Precomputed file_ext(path), to avoid parsing the path again
         
     Returns:
         MIME type string
     """
-    ext = os.path.splitext(path)[1].lower()
+    if ext is None:
+        ext = file_ext(path)
     
     # Handle known extensions explicitly
-    if ext == ".pdf":
-        return "application/pdf"
-    elif ext == ".md":
-        return "text/markdown"
-    elif ext == ".txt":
-        return "text/plain"
+    mime_type = _MIME_BY_EXT.get(ext)
+    if mime_type:
+        return mime_type
     
     # Fall back to mimetypes module
     mime_type, _ = mimetypes.guess_type(path)
@@ -139,33 +270,30 @@ def sniff_mime(path: str) -> str:
     return "text/plain"
 
 
-def read_text_any(path: str) -> Tuple[str, int]:
+def read_text_any(path: str, ext: Optional[str] = None, page_workers: int = 1) -> Tuple[str, int]:
     """
     Read text content from various file formats.
     
     Args:
         path: Path to the file
+        ext: Precomputed file_ext(path), to avoid parsing the path again
+        page_workers: Processes to split long PDFs across (1 reads inline)
         
     Returns:
         Tuple of (text_content, page_count)
         
     Raises:
-        FileNotFoundError: If file doesn't exist
-        PermissionError: If file cannot be read
+        FileNotFoundError: If file doesn't exist (from open)
+        PermissionError: If file cannot be read (from open)
         ImportError: If required libraries are missing
         Exception: If text extraction fails
     """
-    if not os.path.exists(path):
-        raise FileNotFoundError(f"File not found: {path}")
-    
-    if not os.access(path, os.R_OK):
-        raise PermissionError(f"Cannot read file: {path}")
-    
-    ext = os.path.splitext(path)[1].lower()
+    if ext is None:
+        ext = file_ext(path)
     
     try:
         if ext == ".pdf":
-            return _read_pdf_text(path)
+            return _read_pdf_text(path, page_workers)
         else:
             return _read_text_file(path)
             
@@ -174,34 +302,148 @@ def read_text_any(path: str) -> Tuple[str, int]:
         raise
 
 
-def _read_pdf_text(path: str) -> Tuple[str, int]:
-    """Read text from PDF file."""
-    try:
-        import pdfplumber
-    except ImportError:
-        raise ImportError("pdfplumber is required for PDF processing. Install with: pip install pdfplumber")
+def iter_pages_any(path: str, ext: Optional[str] = None, page_workers: int = 1) -> Iterator[str]:
+    """
+    Yield a document's text one page at a time.
+    
+    PDFs yield one string per page; plain text files are a single page.
+    Lets callers clean page by page instead of materializing the whole
+    document first (see normalize_text_stream).
+    
+    Args:
+        path: Path to the file
+        ext: Precomputed file_ext(path), to avoid parsing the path again
+        page_workers: Processes to split long PDFs across (1 reads inline)
+        
+    Yields:
+        Page text
+        
+    Raises:
+        FileNotFoundError: If file doesn't exist (from open)
+        ImportError: If required libraries are missing
+    """
+    if ext is None:
+        ext = file_ext(path)
     
+    if ext == ".pdf":
+        yield from _iter_pdf_pages(path, page_workers)
+    else:
+        yield _read_text_file(path)[0]
+
+
+def _read_pdf_text(path: str, page_workers: int = 1) -> Tuple[str, int]:
+    """Read text from PDF file using the configured backend."""
     try:
-        pages = []
-        with pdfplumber.open(path) as pdf:
-            for page_num, page in enumerate(pdf.pages):
-                try:
-                    text = page.extract_text() or ""
-                    pages.append(text)
-                    logger.debug(f"Extracted text from PDF page {page_num + 1}")
-                except Exception as e:
-                    logger.warning(f"Failed to extract text from PDF page {page_num + 1}: {e}")
-                    pages.append("")
+        # Write pages straight into one buffer rather than keeping a list of
+        # page strings alive next to their joined copy
+        buf = io.StringIO()
+        n_pages = 0
+        for n_pages, text in enumerate(_iter_pdf_pages(path, page_workers), 1):
+            if n_pages > 1:
+                buf.write("\n")
+            buf.write(text)
         
-        full_text = "\n".join(pages)
-        logger.info(f"Extracted {len(pages)} pages from PDF: {path}")
-        return full_text, len(pages)
+        logger.info(f"Extracted {n_pages} pages from PDF: {path}")
+        return buf.getvalue(), n_pages
         
     except Exception as e:
         logger.error(f"PDF processing failed for {path}: {e}")
         raise
 
 
+def _iter_pdf_pages(path: str, page_workers: int = 1) -> Iterator[str]:
+    """Yield PDF page texts in order using the configured backend."""
+    backend = os.getenv("PDF_BACKEND", DEFAULT_PDF_BACKEND).lower()
+    if backend == "pdfplumber":
+        yield from _iter_pdf_pages_pdfplumber(path)
+        return
+    
+    try:
+        import fitz
+    except ImportError:
+        raise ImportError("PyMuPDF is required for PDF processing. Install with: pip install pymupdf")
+    
+    with fitz.open(path) as doc:
+        n_pages = len(doc)
+        # PyMuPDF holds the GIL and is not thread-safe, so long PDFs are
+        # split into page ranges across processes instead, but only when the
+        # caller asks for it (a file-level pool already fills the CPUs).
+        if page_workers <= 1 or n_pages <= PDF_PARALLEL_MIN_PAGES:
+            for page_num, page in enumerate(doc):
+                try:
+                    yield page.get_text("text")
+                except Exception as e:
+                    logger.warning(f"Failed to extract text from PDF page {page_num + 1}: {e}")
+                    yield ""
+            return
+    
+    step = -(-n_pages // page_workers)
+    executor = _pdf_page_pool(page_workers)
+    futures = [
+        executor.submit(_pdf_page_range_text, path, start, min(start + step, n_pages))
+        for start in range(0, n_pages, step)
+    ]
+    for future in futures:
+        yield from future.result()
+
+
+_pdf_pool: Optional[ProcessPoolExecutor] = None
+_pdf_pool_workers = 0
+_pdf_pool_lock = threading.Lock()
+
+
+def _pdf_page_pool(workers: int) -> ProcessPoolExecutor:
+    """Return the shared PDF page pool, (re)creating it lazily at the requested size."""
+    global _pdf_pool, _pdf_pool_workers
+    with _pdf_pool_lock:
+        if _pdf_pool is None or _pdf_pool_workers != workers:
+            if _pdf_pool is not None:
+                _pdf_pool.shutdown(wait=True)
+            _pdf_pool = ProcessPoolExecutor(max_workers=workers)
+            _pdf_pool_workers = workers
+        return _pdf_pool
+
+
+@atexit.register
+def _shutdown_pdf_page_pool() -> None:
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is not None:
+            _pdf_pool.shutdown(wait=True)
+            _pdf_pool = None
+
+
+def _pdf_page_range_text(path: str, start: int, stop: int) -> List[str]:
+    """Extract text for pages [start, stop) of a PDF with PyMuPDF (one Document per process)."""
+    import fitz
+    
+    texts = []
+    with fitz.open(path) as doc:
+        for page_num in range(start, stop):
+            try:
+                texts.append(doc[page_num].get_text("text"))
+            except Exception as e:
+                logger.warning(f"Failed to extract text from PDF page {page_num + 1}: {e}")
+                texts.append("")
+    return texts
+
+
+def _iter_pdf_pages_pdfplumber(path: str) -> Iterator[str]:
+    """Yield PDF page texts with pdfplumber (slower fallback backend)."""
+    try:
+        import pdfplumber
+    except ImportError:
+        raise ImportError("pdfplumber is required for PDF_BACKEND=pdfplumber. Install with: pip install pdfplumber")
+    
+    with pdfplumber.open(path) as pdf:
+        for page_num, page in enumerate(pdf.pages):
+            try:
+                yield page.extract_text() or ""
+            except Exception as e:
+                logger.warning(f"Failed to extract text from PDF page {page_num + 1}: {e}")
+                yield ""
+
+
 def _read_text_file(path: str) -> Tuple[str, int]:
     """Read text from plain text file."""
     try:
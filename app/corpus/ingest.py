@@ -12,13 +12,15 @@ import os
 import hashlib
 import json
 import logging
-from typing import Optional, Dict, List, Tuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from functools import partial
+from typing import Optional, Dict, List, Tuple, Union
 from pathlib import Path
 
-from .files import iter_paths, read_text_any, sniff_mime, file_sha256
-from .clean import normalize_text
+from .files import iter_paths_parallel, iter_pages_any, sniff_mime, file_sha256, file_ext
+from .clean import normalize_text_stream
 from .chunk import chunk_text
-from .schema import connect, init_db, upsert_document, upsert_chunks
+from .schema import connect, init_db, upsert_document, upsert_chunks, cached_sha256, upsert_hash_cache
 from .interfaces import ProcessingStats, DocumentData, ChunkData
 
 logger = logging.getLogger(__name__)
@@ -29,6 +31,9 @@ DEFAULT_SOURCE = "local"
 DEFAULT_MAX_CHARS = 1200
 DEFAULT_OVERLAP = 150
 DEFAULT_DATA_ROOT = "data"
+DEFAULT_WORKERS = min(os.cpu_count() or 1, 4)  # parsing gains flatten past ~4 processes
+COMMIT_EVERY = 32  # documents per transaction
+COMMIT_EVERY_CHUNKS = 4096  # ...or chunks per transaction, whichever comes first
 
 def _doc_id_for(sha256_hex: str) -> str:
     """
@@ -40,13 +45,7 @@ def _doc_id_for(sha256_hex: str) -> str:
     Returns:
         Stable document ID (24 characters)
     """
-    try:
-        doc_id = hashlib.sha256(sha256_hex.encode("utf-8")).hexdigest()[:24]
-        logger.debug(f"Generated document ID: {doc_id}")
-        return doc_id
-    except Exception as e:
-        logger.error(f"Failed to generate document ID: {e}")
-        raise
+    return hashlib.sha256(sha256_hex.encode("utf-8")).hexdigest()[:24]
 
 
 def _chunk_id(doc_id: str, start: int, end: int) -> str:
@@ -61,13 +60,7 @@ def _chunk_id(doc_id: str, start: int, end: int) -> str:
     Returns:
         Stable chunk ID (24 characters)
     """
-    try:
-        chunk_id = hashlib.sha256(f"{doc_id}:{start}:{end}".encode("utf-8")).hexdigest()[:24]
-        logger.debug(f"Generated chunk ID: {chunk_id}")
-        return chunk_id
-    except Exception as e:
-        logger.error(f"Failed to generate chunk ID: {e}")
-        raise
+    return hashlib.sha256(f"{doc_id}:{start}:{end}".encode("utf-8")).hexdigest()[:24]
 
 def ingest_path(
     root: str, 
@@ -75,11 +68,20 @@ def ingest_path(
     source: str = DEFAULT_SOURCE, 
     max_chars: int = DEFAULT_MAX_CHARS, 
     overlap: int = DEFAULT_OVERLAP, 
-    heading_aware: bool = True
+    heading_aware: bool = True,
+    workers: Optional[int] = None,
+    force: bool = False,
+    walk_workers: int = 1
 ) -> ProcessingStats:
     """
     Ingest documents from a directory or single file into the database.
     
+    Reading, cleaning and chunking run in a process pool; database writes
+    stay serial in the calling process. Every file is hashed on a thread pool
+    (or its SHA256 taken from the (path, mtime, size) hash cache) before
+    parsing, and files whose document is already stored are skipped without
+    being read.
+    
     Args:
         root: Path to directory or single file to ingest
         db_path: Path to SQLite database file
@@ -87,6 +89,10 @@ def ingest_path(
         max_chars: Maximum characters per chunk
         overlap: Character overlap between chunks
         heading_aware: Whether to use heading-aware chunking
+        workers: Parser processes (defaults to DEFAULT_WORKERS; 1 parses inline,
+            and a lone long PDF is split across them by page)
+        force: Re-parse files even if their document is already stored
+        walk_workers: Threads scanning directories (1 walks serially)
         
     Returns:
         Processing statistics dictionary
@@ -102,6 +108,15 @@ def ingest_path(
     logger.info(f"Starting ingestion from: {root}")
     logger.info(f"Parameters: max_chars={max_chars}, overlap={overlap}, heading_aware={heading_aware}")
     
+    parse = partial(
+        _parse_file,
+        source=source,
+        max_chars=max_chars,
+        overlap=overlap,
+        heading_aware=heading_aware
+    )
+    executor = None
+    
     try:
         # Initialize database
         conn = connect(db_path)
@@ -109,36 +124,78 @@ def ingest_path(
         
         n_docs = 0
         n_chunks = 0
+        pending_docs = 0
+        pending_chunks = 0
         processed_files = []
         skipped_files = []
+        unchanged_files = []
         
-        for file_path in iter_paths(root):
-            try:
-                logger.info(f"Processing file: {file_path}")
-                
-                # Read and process document
-                raw_text, n_pages = read_text_any(file_path)
-                if not raw_text.strip():
-                    logger.warning(f"Skipping empty file: {file_path}")
-                    skipped_files.append(file_path)
-                    continue
-                
-                # Clean and chunk text
-                clean_text = normalize_text(raw_text)
-                chunks = chunk_text(
-                    clean_text, 
-                    heading_aware=heading_aware, 
-                    max_chars=max_chars, 
-                    overlap=overlap
-                )
-                
-                if not chunks:
-                    logger.warning(f"No chunks created for: {file_path}")
-                    skipped_files.append(file_path)
+        if workers is None:
+            workers = DEFAULT_WORKERS
+        
+        # Resolve every file's hash up front (hashing is far cheaper than
+        # parsing) so already-stored documents never reach the parser.
+        # Cache lookups stay here; files missing from the cache are hashed in parallel.
+        entries = []
+        for p, ext, size, mtime in iter_paths_parallel(root, walk_workers):
+            key = (os.path.abspath(p), mtime, size)
+            entries.append((p, ext, key, cached_sha256(conn, *key)))
+        uncached = [p for p, _, _, sha_hex in entries if sha_hex is None]
+        hashed = iter(_hash_files(uncached, workers))
+        
+        todo = []
+        for p, ext, key, sha_hex in entries:
+            if sha_hex is None:
+                sha_hex = next(hashed)
+                if isinstance(sha_hex, OSError):
+                    logger.error(f"Failed to hash file {p}: {sha_hex}")
+                    skipped_files.append(p)
                     continue
-                
-                # Process document metadata
-                doc_metadata = _process_document_metadata(file_path, source)
+                upsert_hash_cache(conn, *key, sha_hex)
+            if not force and conn.execute("SELECT 1 FROM documents WHERE sha256 = ?", (sha_hex,)).fetchone():
+                unchanged_files.append(p)
+                continue
+            todo.append((p, ext, sha_hex))
+        total = len(todo)
+        if unchanged_files:
+            logger.info(f"Skipping {len(unchanged_files)} already-stored files")
+        
+        # A single file to parse (typically one large PDF) gets the worker
+        # processes for its pages instead
+        page_workers = workers if total == 1 else 1
+        workers = max(1, min(workers, total))
+        if workers > 1:
+            executor = ProcessPoolExecutor(max_workers=workers)
+        
+        # Each entry pairs a path with a zero-arg callable that returns its parse
+        # result (or raises), so pooled and inline parsing share one loop.
+        # Pooled results are drained in completion order so one slow PDF does
+        # not hold back writes for files that finished behind it.
+        if executor is not None:
+            futures = {executor.submit(parse, p, sha256=sha, ext=ext): p for p, ext, sha in todo}
+            parsed = ((futures[f], f.result) for f in as_completed(futures))
+        else:
+            parsed = ((p, partial(parse, p, sha256=sha, ext=ext, page_workers=page_workers)) for p, ext, sha in todo)
+        
+        for done, (file_path, get_result) in enumerate(parsed, 1):
+            logger.info("[%d/%d] Processing file: %s", done, total, file_path)
+            try:
+                result = get_result()
+            except Exception as e:
+                logger.error(f"Failed to process file {file_path}: {e}")
+                skipped_files.append(file_path)
+                continue
+            if result is None:
+                skipped_files.append(file_path)
+                continue
+            
+            # Documents share one transaction; a savepoint lets a failing file
+            # roll back its own rows without discarding the rest of the batch
+            if not conn.in_transaction:
+                conn.execute("BEGIN")
+            conn.execute("SAVEPOINT doc")
+            try:
+                doc_metadata, n_pages, chunks = result
                 doc_id = _get_or_create_document_id(conn, doc_metadata)
                 
                 # Store document
@@ -155,21 +212,29 @@ def ingest_path(
                 # Process and store chunks
                 chunk_rows = _prepare_chunk_rows(doc_id, chunks, doc_metadata)
                 upsert_chunks(conn, chunk_rows)
-                
-                # Commit transaction
-                conn.commit()
-                
-                n_docs += 1
-                n_chunks += len(chunk_rows)
-                processed_files.append(file_path)
-                
-                logger.info(f"Successfully processed: {file_path} ({len(chunk_rows)} chunks)")
+                conn.execute("RELEASE doc")
                 
             except Exception as e:
                 logger.error(f"Failed to process file {file_path}: {e}")
-                conn.rollback()
+                conn.execute("ROLLBACK TO doc")
+                conn.execute("RELEASE doc")
                 skipped_files.append(file_path)
                 continue
+            
+            n_docs += 1
+            n_chunks += len(chunk_rows)
+            pending_docs += 1
+            pending_chunks += len(chunk_rows)
+            processed_files.append(file_path)
+            logger.info(f"Successfully processed: {file_path} ({len(chunk_rows)} chunks)")
+            
+            if pending_docs >= COMMIT_EVERY or pending_chunks >= COMMIT_EVERY_CHUNKS:
+                conn.commit()
+                pending_docs = pending_chunks = 0
+        
+        conn.commit()
+        # refresh planner statistics for the tables we just grew
+        conn.execute("PRAGMA optimize")
         
         # Final statistics
         stats = {
@@ -177,6 +242,7 @@ def ingest_path(
             "chunks": n_chunks,
             "processed_files": processed_files,
             "skipped_files": skipped_files,
+            "unchanged_files": unchanged_files,
             "db": db_path
         }
         
@@ -190,24 +256,120 @@ def ingest_path(
         logger.error(f"Ingestion failed: {e}")
         raise
     finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
         if 'conn' in locals():
             conn.close()
 
 
-def _process_document_metadata(file_path: str, source: str) -> DocumentData:
+def _hash_one(file_path: str) -> Union[str, OSError]:
+    try:
+        return file_sha256(file_path)
+    except OSError as e:
+        return e
+
+
+def _hash_files(paths: List[str], workers: int) -> List[Union[str, OSError]]:
+    """
+    SHA256 each file, in input order, on up to `workers` threads.
+    
+    hashlib releases the GIL while digesting, so threads hash files in
+    parallel without pickling paths to a process pool.
+    
+    Args:
+        paths: Files to hash
+        workers: Maximum hashing threads (1 hashes inline)
+        
+    Returns:
+        Hex digest per path, or the OSError that prevented reading it
+    """
+    if workers > 1 and len(paths) > 1:
+        with ThreadPoolExecutor(max_workers=min(workers, len(paths))) as ex:
+            return list(ex.map(_hash_one, paths))
+    return [_hash_one(p) for p in paths]
+
+
+def _parse_file(
+    file_path: str,
+    source: str,
+    max_chars: int,
+    overlap: int,
+    heading_aware: bool,
+    sha256: Optional[str] = None,
+    ext: Optional[str] = None,
+    page_workers: int = 1
+) -> Optional[Tuple[DocumentData, int, List[ChunkData]]]:
+    """
+    Read, clean, chunk and fingerprint one file without touching the database.
+    
+    Pure and picklable so it can run in a worker process.
+    
+    Args:
+        file_path: Path to the document file
+        source: Source label for the document
+        max_chars: Maximum characters per chunk
+        overlap: Character overlap between chunks
+        heading_aware: Whether to use heading-aware chunking
+        sha256: Known file hash from the hash cache; computed when None
+        ext: Extension already parsed by iter_paths; parsed here when None
+        page_workers: Processes to split a long PDF across (1 reads inline)
+        
+    Returns:
+        Tuple of (doc_metadata, n_pages, chunks), or None if the file yields no chunks
+    """
+    if ext is None:
+        ext = file_ext(file_path)
+    
+    # Clean page by page so the raw document text is never held in full
+    n_pages = 0
+    
+    def counted_pages():
+        nonlocal n_pages
+        for page in iter_pages_any(file_path, ext, page_workers):
+            n_pages += 1
+            yield page
+    
+    clean_text = "".join(normalize_text_stream(counted_pages()))
+    if not clean_text:
+        logger.warning(f"Skipping empty file: {file_path}")
+        return None
+    
+    chunks = chunk_text(
+        clean_text, 
+        heading_aware=heading_aware, 
+        max_chars=max_chars, 
+        overlap=overlap
+    )
+    
+    if not chunks:
+        logger.warning(f"No chunks created for: {file_path}")
+        return None
+    
+    doc_metadata = _process_document_metadata(file_path, source, sha256, ext)
+    return doc_metadata, n_pages, chunks
+
+
+def _process_document_metadata(
+    file_path: str,
+    source: str,
+    sha256: Optional[str] = None,
+    ext: Optional[str] = None
+) -> DocumentData:
     """
     Process document metadata including MIME type, source label, and path.
     
     Args:
         file_path: Path to the document file
         source: Source label for the document
+        sha256: Precomputed file hash; the file is hashed when None
+        ext: Precomputed file extension
         
     Returns:
         Document metadata dictionary
     """
     try:
         # Get MIME type and determine source label
-        mime = sniff_mime(file_path)
+        mime = sniff_mime(file_path, ext)
         if mime == "application/pdf":
             src_label = "pdf"
         elif mime == "text/markdown":
@@ -216,7 +378,7 @@ def _process_document_metadata(file_path: str, source: str) -> DocumentData:
             src_label = "txt"
         
         # Compute file hash
-        sha_hex = file_sha256(file_path)
+        sha_hex = sha256 or file_sha256(file_path)
         
         # Process path for storage
         abs_path = os.path.abspath(file_path)
@@ -274,34 +436,29 @@ def _prepare_chunk_rows(doc_id: str, chunks: List[ChunkData], doc_metadata: Docu
     
     Args:
         doc_id: Document ID
-        chunks: List of chunk dictionaries
+        chunks: List of ChunkData windows
         doc_metadata: Document metadata
         
     Returns:
         List of chunk tuples for database insertion
     """
     try:
-        rows = []
-        for i, chunk in enumerate(chunks):
-            chunk_id = _chunk_id(doc_id, chunk["start_char"], chunk["end_char"])
-            meta = {
-                "source": doc_metadata["source_label"], 
-                "path": doc_metadata["stored_path"], 
-                "mime": doc_metadata["mime"]
-            }
-            
-            row = (
-                chunk_id,
-                doc_id,
-                i,
-                chunk["text"],
-                len(chunk["text"]),
-                chunk["start_char"],
-                chunk["end_char"],
-                chunk["section"],
-                json.dumps(meta)
-            )
-            rows.append(row)
+        # Metadata is per-document, so serialize it once for every chunk row
+        meta_json = json.dumps({
+            "source": doc_metadata["source_label"], 
+            "path": doc_metadata["stored_path"], 
+            "mime": doc_metadata["mime"]
+        })
+        
+        # ChunkData is slotted, so each field read is a cheap descriptor access.
+        # text_sha256 matches app.embed.store.sha256_text, so embedding refreshes compare it in SQL.
+        sha256 = hashlib.sha256
+        rows = [
+            (_chunk_id(doc_id, c.start_char, c.end_char), doc_id, i,
+             c.text, c.start_char, c.end_char, c.section, meta_json,
+             sha256(c.text.encode("utf-8", errors="ignore"), usedforsecurity=False).hexdigest())
+            for i, c in enumerate(chunks)
+        ]
         
         logger.debug(f"Prepared {len(rows)} chunk rows for document {doc_id}")
         return rows
@@ -11,7 +11,7 @@ import sys
 import logging
 from typing import Optional
 
-from .ingest import ingest_path
+from .ingest import ingest_path, DEFAULT_WORKERS
 
 # Configure logging
 logging.basicConfig(
@@ -45,6 +45,9 @@ Examples:
     parser.add_argument("--max-chars", type=int, default=1200, help="Maximum characters per chunk")
     parser.add_argument("--overlap", type=int, default=150, help="Character overlap between chunks")
     parser.add_argument("--no-heading-aware", action="store_true", help="Disable heading-aware segmentation")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Parallel parser processes (1 disables the pool)")
+    parser.add_argument("--walk-workers", type=int, default=1, help="Threads for directory scanning on very large trees")
+    parser.add_argument("--force", action="store_true", help="Re-parse files whose document is already stored")
     parser.add_argument("--verbose", "-v", action="store_true", help="Enable verbose logging")
     parser.add_argument("--dry-run", action="store_true", help="Show what would be processed without actually ingesting")
 
@@ -68,6 +71,14 @@ Examples:
         logger.error("overlap must be non-negative")
         return 1
     
+    if args.workers <= 0:
+        logger.error("workers must be positive")
+        return 1
+    
+    if args.walk_workers <= 0:
+        logger.error("walk-workers must be positive")
+        return 1
+    
     if args.overlap >= args.max_chars:
         logger.warning(f"Overlap ({args.overlap}) >= max-chars ({args.max_chars}), reducing overlap")
         args.overlap = max(0, args.max_chars - 1)
@@ -84,6 +95,7 @@ Examples:
         logger.info(f"Database: {args.db}")
         logger.info(f"Source: {args.source}")
         logger.info(f"Chunking: max_chars={args.max_chars}, overlap={args.overlap}, heading_aware={not args.no_heading_aware}")
+        logger.info(f"Workers: {args.workers}")
         
         # Perform ingestion
         stats = ingest_path(
@@ -92,7 +104,10 @@ Examples:
             source=args.source,
             max_chars=args.max_chars,
             overlap=args.overlap,
-            heading_aware=(not args.no_heading_aware)
+            heading_aware=(not args.no_heading_aware),
+            workers=args.workers,
+            force=args.force,
+            walk_workers=args.walk_workers
         )
         
         # Report results
@@ -107,6 +122,9 @@ Examples:
                 for file_path in stats['processed_files']:
                     print(f"  ✓ {file_path}")
         
+        if stats.get('unchanged_files'):
+            print(f"Already stored (skipped): {len(stats['unchanged_files'])}")
+        
         if stats.get('skipped_files'):
             print(f"Skipped files: {len(stats['skipped_files'])}")
             if args.verbose:
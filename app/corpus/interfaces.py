@@ -4,6 +4,7 @@ Base interfaces and protocols for corpus processing components.
 """
 from __future__ import annotations
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
 from typing import List, Dict, Any, Iterator, Tuple, Optional
 from pathlib import Path
 
@@ -29,7 +30,7 @@ class TextChunker(ABC):
     """Abstract base class for text chunking operations."""
     
     @abstractmethod
-    def chunk(self, text: str, **kwargs) -> List[Dict[str, Any]]:
+    def chunk(self, text: str, **kwargs) -> List[ChunkData]:
         """
         Chunk text into segments.
         
@@ -38,7 +39,7 @@ class TextChunker(ABC):
             **kwargs: Additional chunking parameters
             
         Returns:
-            List of chunk dictionaries
+            List of ChunkData windows
         """
         pass
 
@@ -101,8 +102,16 @@ class DatabaseManager(ABC):
         pass
 
 
+@dataclass(slots=True, frozen=True)
+class ChunkData:
+    """A single chunk window produced by the chunker."""
+    text: str
+    start_char: int
+    end_char: int
+    section: Optional[str]
+
+
 # Type aliases for better code clarity
-ChunkData = Dict[str, Any]
 DocumentData = Dict[str, Any]
 ProcessingStats = Dict[str, Any]
 FileMetadata = Dict[str, Any]
@@ -10,11 +10,14 @@ This module provides functions for:
 - Conversation memory storage
 """
 from __future__ import annotations
-import sqlite3
 import json
+import sqlite3
 import time
 import logging
-from typing import Iterable, List, Dict, Tuple, Optional, Any
+from contextlib import contextmanager
+from functools import lru_cache
+from itertools import chain, islice
+from typing import Iterable, Iterator, List, Dict, Tuple, Optional, Any, Callable
 from pathlib import Path
 
 from .interfaces import DatabaseManager, DocumentData, ChunkData, ProcessingStats
@@ -25,14 +28,92 @@ logger = logging.getLogger(__name__)
 DEFAULT_DB_PATH = "rag_local.db"
 DEFAULT_BATCH_SIZE = 900
 DEFAULT_FAISS_ID_RANGE = 2**63
+DEFAULT_MMAP_SIZE = 256 << 20  # 256MB of the database file mapped for reads
+DEFAULT_CACHE_SIZE_KB = 131072  # 128MB page cache (negative cache_size = KiB)
+MAX_SQL_PARAMS = 999  # SQLITE_MAX_VARIABLE_NUMBER on builds older than 3.32
+
+# n_chars is derived from text by SQLite (length() counts characters, like len())
+_UPSERT_CHUNKS_HEAD = (
+    "INSERT INTO chunks(id, doc_id, ordinal, text, start_char, end_char, section, meta_json, text_sha256, n_chars) "
+    "SELECT column1, column2, column3, column4, column5, column6, column7, column8, column9, length(column4) FROM ("
+)
+_UPSERT_CHUNKS_TAIL = ") WHERE true ON CONFLICT(id) DO NOTHING"
+_UPSERT_EMBEDDINGS_HEAD = "INSERT INTO embeddings(chunk_id, model, dim, vec, faiss_id)"
+_UPSERT_EMBEDDINGS_TAIL = "ON CONFLICT(chunk_id, model) DO UPDATE SET vec=excluded.vec, faiss_id=excluded.faiss_id, dim=excluded.dim"
+_FAISS_IDS_JSON_SQL = "SELECT e.faiss_id, e.chunk_id FROM json_each(?) j JOIN embeddings e ON e.faiss_id = j.value"
+
+
+# Full schema, created idempotently by init_db. Connection PRAGMAs live in
+# _configure_pragmas since they are per-connection, not per-database.
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS documents (
+    id TEXT PRIMARY KEY,
+    path TEXT,
+    source TEXT,
+    sha256 TEXT,
+    mime TEXT,
+    n_pages INTEGER,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS chunks (
+    id TEXT PRIMARY KEY,
+    doc_id TEXT,
+    ordinal INTEGER,
+    text TEXT,
+    n_chars INTEGER,
+    start_char INTEGER,
+    end_char INTEGER,
+    section TEXT,
+    meta_json TEXT,
+    text_sha256 TEXT,  -- lets embedding refreshes find changed text in SQL
+    FOREIGN KEY(doc_id) REFERENCES documents(id)
+);
+
+CREATE TABLE IF NOT EXISTS embeddings (
+    chunk_id TEXT,
+    model TEXT,
+    dim INTEGER,
+    vec BLOB,
+    faiss_id INTEGER,
+    dtype TEXT DEFAULT 'float32',  -- or 'int8-sym': float32 scale + int8[dim]
+    text_sha256 TEXT,  -- hash of the embedded text; a mismatch with chunks.text_sha256 marks it stale
+    created_at INTEGER,
+    PRIMARY KEY(chunk_id, model),
+    FOREIGN KEY(chunk_id) REFERENCES chunks(id)
+);
 
+-- Conversation memory
+CREATE TABLE IF NOT EXISTS conversations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id TEXT NOT NULL,
+    role TEXT NOT NULL,         -- 'user' or 'assistant'
+    content TEXT NOT NULL,
+    embedding BLOB,             -- optional: store embedding for semantic memory
+    created_at REAL DEFAULT (strftime('%s','now'))
+);
 
-def connect(db_path: str = DEFAULT_DB_PATH) -> sqlite3.Connection:
+-- File hash cache: lets re-ingestion skip hashing unchanged files
+CREATE TABLE IF NOT EXISTS hash_cache (
+    path TEXT PRIMARY KEY,
+    mtime REAL,
+    size INTEGER,
+    sha256 TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_conversations_session ON conversations(session_id);
+CREATE INDEX IF NOT EXISTS idx_chunks_doc_id ON chunks(doc_id);
+-- re-ingest looks up every walked file's hash before deciding to skip it
+CREATE INDEX IF NOT EXISTS idx_documents_sha256 ON documents(sha256);
+"""
+
+def connect(db_path: str = DEFAULT_DB_PATH, row_factory: Optional[Callable] = sqlite3.Row) -> sqlite3.Connection:
     """
     Create a database connection with proper configuration.
     
     Args:
         db_path: Path to SQLite database file
+        row_factory: Row factory for the connection; None yields plain tuples
         
     Returns:
         SQLite connection object with row factory
@@ -47,10 +128,11 @@ def connect(db_path: str = DEFAULT_DB_PATH) -> sqlite3.Connection:
         db_path_obj.parent.mkdir(parents=True, exist_ok=True)
         
         conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row
+        conn.row_factory = row_factory
         
         # Enable foreign key constraints
         conn.execute("PRAGMA foreign_keys = ON")
+        _configure_pragmas(conn)
         
         logger.info(f"Connected to database: {db_path}")
         return conn
@@ -63,6 +145,109 @@ def connect(db_path: str = DEFAULT_DB_PATH) -> sqlite3.Connection:
         raise
 
 
+def _configure_pragmas(conn: sqlite3.Connection) -> None:
+    """
+    Apply write-throughput PRAGMAs to a new connection.
+    
+    WAL appends instead of writing a rollback journal, and with
+    synchronous=NORMAL only checkpoints fsync rather than every commit.
+    Filesystems without shared-memory support keep their current journal mode.
+    
+    Args:
+        conn: Database connection
+    """
+    mode = conn.execute("PRAGMA journal_mode = WAL").fetchone()[0]
+    if mode.lower() != "wal":
+        logger.warning(f"WAL journal mode unavailable, using {mode}")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    conn.execute(f"PRAGMA cache_size = -{DEFAULT_CACHE_SIZE_KB}")
+    conn.execute(f"PRAGMA mmap_size = {DEFAULT_MMAP_SIZE}")
+
+
+# Secondary embedding indexes not needed while bulk-writing vectors
+_EMBEDDING_BULK_INDEXES = {
+    "idx_embeddings_chunk_id": "CREATE INDEX IF NOT EXISTS idx_embeddings_chunk_id ON embeddings(chunk_id)",
+    "idx_embeddings_faiss_id": "CREATE INDEX IF NOT EXISTS idx_embeddings_faiss_id ON embeddings(faiss_id)",
+}
+
+
+def drop_embedding_indexes(conn: sqlite3.Connection) -> None:
+    """
+    Drop secondary embedding indexes before a bulk insert.
+    
+    Call create_embedding_indexes once the insert finishes; building an index
+    once is cheaper than maintaining it row by row.
+    
+    Args:
+        conn: Database connection
+    """
+    for name in _EMBEDDING_BULK_INDEXES:
+        conn.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+def create_embedding_indexes(conn: sqlite3.Connection) -> None:
+    """
+    (Re)create the secondary embedding indexes.
+    
+    Args:
+        conn: Database connection
+    """
+    for ddl in _EMBEDDING_BULK_INDEXES.values():
+        conn.execute(ddl)
+
+
+@contextmanager
+def bulk_ingest_context(conn: sqlite3.Connection, table: str) -> Iterator[sqlite3.Connection]:
+    """
+    Suspend per-row foreign key enforcement for a bulk load into one table.
+    
+    Must be entered outside a transaction (SQLite ignores PRAGMA foreign_keys
+    inside one). Transactions stay with the caller; on a clean exit the
+    table's references are checked once with PRAGMA foreign_key_check and
+    violations are logged. They are not raised: the caller's writes are
+    already committed, and the check also sees orphans left by earlier runs.
+    
+    Args:
+        conn: Database connection
+        table: Table being bulk-loaded
+        
+    Yields:
+        The same connection
+    """
+    conn.execute("PRAGMA foreign_keys = OFF")
+    try:
+        yield conn
+        if conn.in_transaction:
+            conn.commit()
+        violations = conn.execute(f"PRAGMA foreign_key_check({table})").fetchall()
+        if violations:
+            logger.warning(
+                f"{len(violations)} rows in {table} reference missing parents "
+                f"(first rowids: {[v[1] for v in violations[:5]]})"
+            )
+    finally:
+        if conn.in_transaction:
+            conn.rollback()
+        conn.execute("PRAGMA foreign_keys = ON")
+
+
+def add_column_if_missing(conn: sqlite3.Connection, table: str, column: str, decl: str) -> None:
+    """
+    Add a column to an existing table created before the column was introduced.
+    
+    Args:
+        conn: Database connection
+        table: Table name
+        column: Column name
+        decl: Column type and constraints, e.g. "TEXT DEFAULT 'float32'"
+    """
+    cols = {r[1] for r in conn.execute(f"PRAGMA table_info({table})")}
+    if cols and column not in cols:
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
+        logger.info(f"Added column {table}.{column}")
+
+
 def init_db(conn: sqlite3.Connection) -> None:
     """
     Initialize database schema with all required tables and indexes.
@@ -76,84 +261,16 @@ def init_db(conn: sqlite3.Connection) -> None:
     try:
         logger.info("Initializing database schema")
         
-        # Documents table
-        conn.execute("""
-        CREATE TABLE IF NOT EXISTS documents (
-            id TEXT PRIMARY KEY,
-            path TEXT,
-            source TEXT,
-            sha256 TEXT,
-            mime TEXT,
-            n_pages INTEGER,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-        """)
-        logger.debug("Created documents table")
-
-        # Chunks table
-        conn.execute("""
-        CREATE TABLE IF NOT EXISTS chunks (
-            id TEXT PRIMARY KEY,
-            doc_id TEXT,
-            ordinal INTEGER,
-            text TEXT,
-            n_chars INTEGER,
-            start_char INTEGER,
-            end_char INTEGER,
-            section TEXT,
-            meta_json TEXT,
-            FOREIGN KEY(doc_id) REFERENCES documents(id)
-        )
-        """)
-        logger.debug("Created chunks table")
-
-        # Embeddings table
-        conn.execute("""
-        CREATE TABLE IF NOT EXISTS embeddings (
-            chunk_id TEXT,
-            model TEXT,
-            dim INTEGER,
-            vec BLOB,
-            faiss_id INTEGER,
-            PRIMARY KEY(chunk_id, model),
-            FOREIGN KEY(chunk_id) REFERENCES chunks(id)
-        )
-        """)
-        logger.debug("Created embeddings table")
-
-        # Conversation memory table
-        conn.execute("""
-        CREATE TABLE IF NOT EXISTS conversations (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            session_id TEXT NOT NULL,
-            role TEXT NOT NULL,         -- 'user' or 'assistant'
-            content TEXT NOT NULL,
-            embedding BLOB,             -- optional: store embedding for semantic memory
-            created_at REAL DEFAULT (strftime('%s','now'))
-        )
-        """)
-        logger.debug("Created conversations table")
-
-        # Create indexes for performance
-        conn.execute("""
-        CREATE INDEX IF NOT EXISTS idx_conversations_session 
-        ON conversations(session_id)
-        """)
-        
-        conn.execute("""
-        CREATE INDEX IF NOT EXISTS idx_chunks_doc_id 
-        ON chunks(doc_id)
-        """)
-        
-        conn.execute("""
-        CREATE INDEX IF NOT EXISTS idx_embeddings_chunk_id 
-        ON embeddings(chunk_id)
-        """)
-        
-        conn.execute("""
-        CREATE INDEX IF NOT EXISTS idx_embeddings_faiss_id 
-        ON embeddings(faiss_id)
-        """)
+        # One C-level call parses and runs every CREATE statement
+        conn.executescript(SCHEMA_SQL)
+        add_column_if_missing(conn, "chunks", "text_sha256", "TEXT")
+        add_column_if_missing(conn, "embeddings", "dtype", "TEXT DEFAULT 'float32'")
+        add_column_if_missing(conn, "embeddings", "text_sha256", "TEXT")
+        add_column_if_missing(conn, "embeddings", "created_at", "INTEGER")
+        # Migration: the (chunk_id, model) primary key already covers the
+        # chunk/model join in missing-embedding scans
+        conn.execute("DROP INDEX IF EXISTS idx_embeddings_chunk_model")
+        create_embedding_indexes(conn)
         
         logger.info("Database schema initialization completed")
         
@@ -190,42 +307,125 @@ def upsert_document(conn: sqlite3.Connection, doc_id: str, path: str, source: st
         raise
 
 
+def _chunked(rows: Iterable[Tuple], n: int) -> Iterator[List[Tuple]]:
+    """Yield successive lists of up to n rows from any iterable."""
+    it = iter(rows)
+    while batch := list(islice(it, n)):
+        yield batch
+
+
+@lru_cache(maxsize=64)
+def _values_sql(head: str, n_cols: int, n_rows: int, tail: str) -> str:
+    """Build (and memoize) an INSERT with n_rows VALUES groups of n_cols parameters."""
+    group = "(" + ",".join("?" * n_cols) + ")"
+    return f"{head} VALUES {','.join([group] * n_rows)} {tail}"
+
+
+def _tuple_cursor(conn: sqlite3.Connection) -> sqlite3.Cursor:
+    """Cursor returning plain tuples; positional access skips sqlite3.Row's name lookup on hot loops."""
+    cur = conn.cursor()
+    cur.row_factory = None
+    return cur
+
+
+@lru_cache(maxsize=64)
+def _in_sql(head: str, n: int) -> str:
+    """Build (and memoize) "<head> IN (?,...)" with n placeholders; equal strings reuse cached statements."""
+    return f"{head} IN ({','.join('?' * n)})"
+
+
+def _insert_multirow(conn: sqlite3.Connection, head: str, tail: str, n_cols: int, rows: Iterable[Tuple]) -> int:
+    """
+    Insert rows using multi-row VALUES statements.
+    
+    Each statement carries as many rows as fit in MAX_SQL_PARAMS, so SQLite
+    steps one statement per ~100-200 rows instead of one per row. Full-size
+    statements share one SQL string and hit the statement cache.
+    
+    Args:
+        conn: Database connection
+        head: "INSERT INTO table(cols)" prefix
+        tail: Conflict clause appended after the VALUES list
+        n_cols: Number of columns per row
+        rows: Iterable of row tuples
+        
+    Returns:
+        Number of rows changed
+    """
+    changed = 0
+    for batch in _chunked(rows, MAX_SQL_PARAMS // n_cols):
+        sql = _values_sql(head, n_cols, len(batch), tail)
+        changed += conn.execute(sql, tuple(chain.from_iterable(batch))).rowcount
+    return changed
+
+
 def upsert_chunks(conn: sqlite3.Connection, rows: Iterable[Tuple]) -> None:
     """
     Upsert chunk records into database.
     
     Args:
         conn: Database connection
-        rows: Iterable of chunk tuples (id, doc_id, ordinal, text, n_chars, start_char, end_char, section, meta_json)
+        rows: Iterable of chunk tuples (id, doc_id, ordinal, text, start_char, end_char, section, meta_json, text_sha256);
+            n_chars is filled in from text.
+            Consumed lazily one statement's worth at a time, so generators are never materialized.
         
     Raises:
         sqlite3.Error: If database operation fails
     """
     try:
-        rows_list = list(rows)
-        if not rows_list:
-            logger.warning("No chunks to upsert")
-            return
-            
-        conn.executemany("""
-        INSERT INTO chunks(id, doc_id, ordinal, text, n_chars, start_char, end_char, section, meta_json)
-        VALUES(?,?,?,?,?,?,?,?,?)
-        ON CONFLICT(id) DO NOTHING
-        """, rows_list)
-        logger.info(f"Upserted {len(rows_list)} chunks")
+        # Existing ids are left alone (not REPLACEd) so embeddings keep their parent row
+        changed = _insert_multirow(conn, _UPSERT_CHUNKS_HEAD, _UPSERT_CHUNKS_TAIL, 9, rows)
+        if changed <= 0:
+            logger.debug("No new chunks to upsert")
+        else:
+            logger.debug("Upserted %d chunks", changed)
     except sqlite3.Error as e:
         logger.error(f"Failed to upsert chunks: {e}")
         raise
 
+def cached_sha256(conn: sqlite3.Connection, path: str, mtime: float, size: int) -> Optional[str]:
+    """
+    Look up a file's SHA256 in the hash cache.
+    
+    Args:
+        conn: Database connection
+        path: Absolute file path
+        mtime: File modification time from stat
+        size: File size in bytes from stat
+        
+    Returns:
+        Cached SHA256 hex digest, or None if missing or the file changed
+    """
+    row = conn.execute(
+        "SELECT sha256 FROM hash_cache WHERE path = ? AND mtime = ? AND size = ?",
+        (path, mtime, size)
+    ).fetchone()
+    return row[0] if row else None
+
+
+def upsert_hash_cache(conn: sqlite3.Connection, path: str, mtime: float, size: int, sha256_hex: str) -> None:
+    """
+    Record a file's SHA256 against its (path, mtime, size).
+    
+    Args:
+        conn: Database connection
+        path: Absolute file path
+        mtime: File modification time from stat
+        size: File size in bytes from stat
+        sha256_hex: SHA256 hash of file content
+    """
+    conn.execute(
+        "INSERT OR REPLACE INTO hash_cache(path, mtime, size, sha256) VALUES(?,?,?,?)",
+        (path, mtime, size, sha256_hex)
+    )
+
+
 def upsert_embeddings(conn, rows: Iterable[Tuple[str, str, int, bytes, int]]) -> None:
     """
     Insert full embedding row: (chunk_id, model, dim, vec, faiss_id)
+    rows may be a generator; it is consumed lazily in statement-sized slabs.
     """
-    conn.executemany("""
-    INSERT INTO embeddings(chunk_id, model, dim, vec, faiss_id)
-    VALUES(?,?,?,?,?)
-    ON CONFLICT(chunk_id, model) DO UPDATE SET vec=excluded.vec, faiss_id=excluded.faiss_id, dim=excluded.dim
-    """, list(rows))
+    _insert_multirow(conn, _UPSERT_EMBEDDINGS_HEAD, _UPSERT_EMBEDDINGS_TAIL, 5, rows)
 
 
 
@@ -254,23 +454,30 @@ def fetch_chunk_texts(conn: sqlite3.Connection, chunk_ids: List[str], batch_size
         for i in range(0, len(chunk_ids), batch_size):
             batch = chunk_ids[i:i + batch_size]
             placeholders = ','.join('?' * len(batch))
-            query = f"SELECT id, text, section, meta_json, doc_id FROM chunks WHERE id IN ({placeholders})"
+            # meta_json is only needed for its source fallback; let SQLite extract it
+            query = (
+                "SELECT id, text, section, doc_id, "
+                "CASE WHEN json_valid(meta_json) THEN json_extract(meta_json, '$.source') END AS meta_source "
+                f"FROM chunks WHERE id IN ({placeholders})"
+            )
             
-            for row in conn.execute(query, batch):
-                try:
-                    meta = json.loads(row["meta_json"] or "{}")
-                except (json.JSONDecodeError, TypeError) as e:
-                    logger.warning(f"Failed to parse meta_json for chunk {row['id']}: {e}")
-                    meta = {}
-                
-                # Fetch document metadata
-                doc = conn.execute("SELECT path, source FROM documents WHERE id=?", (row["doc_id"],)).fetchone()
+            rows = conn.execute(query, batch).fetchall()
+            
+            # Fetch document metadata for the whole batch in one query
+            doc_ids = list({row["doc_id"] for row in rows})
+            docs = {}
+            if doc_ids:
+                doc_query = f"SELECT id, path, source FROM documents WHERE id IN ({','.join('?' * len(doc_ids))})"
+                docs = {d["id"]: d for d in conn.execute(doc_query, doc_ids)}
+            
+            for row in rows:
+                doc = docs.get(row["doc_id"])
                 
                 out[row["id"]] = {
                     "text": row["text"] or "",
                     "section": row["section"] or "",
                     "path": doc["path"] if doc else "",
-                    "source": doc["source"] if doc else meta.get("source", ""),
+                    "source": doc["source"] if doc else (row["meta_source"] or ""),
                 }
         
         logger.debug(f"Fetched metadata for {len(out)} chunks")
@@ -304,11 +511,9 @@ def fetch_full_chunks(conn: sqlite3.Connection, chunk_ids: List[str], batch_size
         
         for i in range(0, len(chunk_ids), batch_size):
             batch = chunk_ids[i:i + batch_size]
-            placeholders = ','.join('?' * len(batch))
-            query = f"SELECT id, text FROM chunks WHERE id IN ({placeholders})"
-            
-            for row in conn.execute(query, batch):
-                out[row["id"]] = row["text"] or ""
+            # Full batches share one SQL string, so only the tail is prepared anew
+            query = _in_sql("SELECT id, text FROM chunks WHERE id", len(batch))
+            out.update((row[0], row[1] or "") for row in _tuple_cursor(conn).execute(query, batch))
         
         logger.debug(f"Fetched full text for {len(out)} chunks")
         return out
@@ -337,7 +542,7 @@ def missing_embedding_chunk_ids(conn: sqlite3.Connection) -> List[Tuple[str, int
         WHERE e.chunk_id IS NULL
         """
         
-        results = [(row["id"], 0) for row in conn.execute(query).fetchall()]
+        results = [(row[0], 0) for row in _tuple_cursor(conn).execute(query)]
         logger.debug(f"Found {len(results)} chunks missing embeddings")
         return results
         
@@ -403,13 +608,17 @@ def chunk_ids_for_faiss_ids(conn: sqlite3.Connection, faiss_ids: List[int], batc
     try:
         out: Dict[int, str] = {}
         
-        for i in range(0, len(faiss_ids), batch_size):
-            batch = faiss_ids[i:i + batch_size]
-            placeholders = ','.join('?' * len(batch))
-            query = f"SELECT faiss_id, chunk_id FROM embeddings WHERE faiss_id IN ({placeholders})"
-            
-            for row in conn.execute(query, batch):
-                out[int(row["faiss_id"])] = row["chunk_id"]
+        try:
+            # One statement for the whole list: ids travel as a single JSON array
+            ids_json = json.dumps([int(i) for i in faiss_ids])
+            out.update((int(row[0]), row[1]) for row in _tuple_cursor(conn).execute(_FAISS_IDS_JSON_SQL, (ids_json,)))
+        except sqlite3.OperationalError:
+            # SQLite built without JSON1: fall back to IN-list batches
+            logger.debug("json_each unavailable, mapping FAISS IDs in batches")
+            for i in range(0, len(faiss_ids), batch_size):
+                batch = faiss_ids[i:i + batch_size]
+                query = _in_sql("SELECT faiss_id, chunk_id FROM embeddings WHERE faiss_id", len(batch))
+                out.update((int(row[0]), row[1]) for row in _tuple_cursor(conn).execute(query, batch))
         
         logger.debug(f"Mapped {len(out)} FAISS IDs to chunk IDs")
         return out
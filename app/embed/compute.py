@@ -1,42 +1,254 @@
 # app/embed/compute.py
 from __future__ import annotations
-import sqlite3, math
-from typing import List, Tuple
+import os, sqlite3, math, queue, threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
 import numpy as np
 
-from app.corpus.schema import connect, init_db
-from .store import init_embedding_table, fetch_chunks_to_embed, upsert_embeddings, sha256_text
+from app.corpus.schema import (
+    connect, init_db, drop_embedding_indexes, create_embedding_indexes, bulk_ingest_context,
+)
+from .store import (
+    count_chunks_to_embed, iter_chunks_to_embed, upsert_embeddings,
+    encode_vectors, DTYPE_FLOAT32,
+)
 from .model import Embedder
 
+# Rows written per transaction: bounds work lost on a crash without paying
+# an fsync per encode batch
+COMMIT_EVERY_ROWS = 1000
+# Batches the reader thread may run ahead of the encoder
+PREFETCH_BATCHES = 4
+# Encoded batches the encoder thread may run ahead of the writer: one is
+# written while the next is encoded
+ENCODE_AHEAD_BATCHES = 1
+# Pending rows above which secondary indexes are dropped and rebuilt once after the
+# writes; smaller incremental passes update them in place instead of rebuilding the table's
+BULK_INDEX_REBUILD_MIN_ROWS = 10_000
+
+# Per-process model for the CPU worker pool (see _init_worker)
+_WORKER_EMB: Optional[Embedder] = None
+
 def compute_embeddings(
     db_path: str = "rag_local.db",
     model_name: str = "BAAI/bge-small-en-v1.5",
     batch_size: int = 64,
     limit_per_pass: int = 5000,
+    store_dtype: str = DTYPE_FLOAT32,
+    device: str | None = None,
+    dtype: str | None = None,
+    workers: int = 1,
 ):
+    """
+    Embed every chunk whose embedding is missing or stale for model_name.
+
+    Under WAL a reader thread streams (ids, texts) batches from its own read-only
+    connection while this thread encodes and writes, so SQLite reads overlap
+    model inference. limit_per_pass is the number of rows the reader pulls per fetch.
+    store_dtype picks the BLOB layout: float32, float16 (2 * dim bytes) or int8-sym
+    (4 + dim bytes), recorded per row in embeddings.dtype for store.dequantize. device/dtype select where and at
+    what precision the model runs (see Embedder). On CPU, workers > 1 runs that many
+    model replicas in a process pool, splitting the cores between them; this
+    process stays the only SQLite writer.
+    """
     conn = connect(db_path)
     init_db(conn)
-    init_embedding_table(conn)
 
-    emb = Embedder(model_name=model_name)
+    # start the pool before any threads so forked workers inherit no locks
+    executor = None
+    if workers > 1 and not (device or "cpu").startswith("cuda"):
+        threads = max(1, (os.cpu_count() or 1) // workers)
+        executor = ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(model_name, device, dtype, threads)
+        )
+    else:
+        emb = Embedder(model_name=model_name, device=device, dtype=dtype)
     total_done = 0
+    # for large passes secondary indexes are rebuilt once after the writes instead of per row
+    rebuild_indexes = count_chunks_to_embed(conn, model_name) >= BULK_INDEX_REBUILD_MIN_ROWS
+    if rebuild_indexes:
+        drop_embedding_indexes(conn)
+        conn.commit()
 
-    while True:
-        todo = fetch_chunks_to_embed(conn, model=model_name, limit=limit_per_pass)
-        print("todo______",todo)
-        if not todo:
-            break
-        
-        print("todo______",todo)
-        # batch over 'todo'
-        for i in range(0, len(todo), batch_size):
-            batch_ids, batch_texts = zip(*todo[i:i+batch_size])
-            vecs: np.ndarray = emb.encode(list(batch_texts), batch_size=batch_size)
-            rows = []
-            for cid, text, vec in zip(batch_ids, batch_texts, vecs):
-                rows.append((cid, vec, sha256_text(text)))
-            upsert_embeddings(conn, model=model_name, dim=emb.dim, batch=rows)
+    wal = conn.execute("PRAGMA journal_mode").fetchone()[0].lower() == "wal"
+    stop = threading.Event()
+    producer = encoder = None
+    if wal:
+        q: queue.Queue = queue.Queue(maxsize=PREFETCH_BATCHES)
+        producer = threading.Thread(
+            target=_produce_batches,
+            args=(db_path, model_name, batch_size, limit_per_pass, q, stop),
+            daemon=True,
+        )
+        producer.start()
+        batches = _drain(q)
+    else:
+        # a long-lived reader would block commits under a rollback journal
+        todo_ids: List[str] = []
+        todo_texts: List[str] = []
+        todo_hashes: List[str] = []
+        for cid, text, h in iter_chunks_to_embed(conn, model_name, limit_per_pass):
+            todo_ids.append(cid)
+            todo_texts.append(text)
+            todo_hashes.append(h)
+        batches = (
+            (todo_ids[i:i + batch_size], todo_texts[i:i + batch_size], todo_hashes[i:i + batch_size])
+            for i in range(0, len(todo_ids), batch_size)
+        )
+
+    if executor is not None:
+        encoded = _encode_pooled(executor, batches, batch_size, max_pending=2 * workers)
+    else:
+        # encode on a second thread so batch N+1 is in the model while batch N is
+        # written; torch and sqlite3 both release the GIL, and conn stays on this thread
+        eq: queue.Queue = queue.Queue(maxsize=ENCODE_AHEAD_BATCHES)
+        encoder = threading.Thread(
+            target=_run_ahead,
+            args=(((ids, hashes, emb.encode(texts, batch_size=batch_size))
+                   for ids, texts, hashes in batches), eq, stop),
+            daemon=True,
+        )
+        encoder.start()
+        encoded = _drain(eq)
+
+    try:
+        # FK checks run once over embeddings at the end instead of per inserted row
+        with bulk_ingest_context(conn, "embeddings"):
+            # one write transaction, committed every COMMIT_EVERY_ROWS
+            conn.execute("BEGIN IMMEDIATE")
+            uncommitted = 0
+            for batch_ids, hashes, vecs in encoded:
+                vecs = np.ascontiguousarray(vecs, dtype=np.float32)
+                dim = vecs.shape[1]
+                vecs = encode_vectors(vecs, store_dtype)
+                # serialize the whole batch once; each row binds a zero-copy slice
+                raw = memoryview(vecs.tobytes())
+                itemsize = vecs.shape[1] * vecs.itemsize
+                rows = [
+                    (cid, raw[i * itemsize:(i + 1) * itemsize], h)
+                    for i, (cid, h) in enumerate(zip(batch_ids, hashes))
+                ]
+                upsert_embeddings(conn, model=model_name, dim=dim, batch=rows,
+                                  dtype=store_dtype)
+                total_done += len(rows)
+                uncommitted += len(rows)
+                if uncommitted >= COMMIT_EVERY_ROWS:
+                    conn.commit()
+                    conn.execute("BEGIN IMMEDIATE")
+                    uncommitted = 0
+            conn.commit()
+    finally:
+        stop.set()
+        if producer is not None:
+            _join_draining(producer, q)
+            _put_sentinel(q)  # unblock an encoder still reading from q
+        if encoder is not None:
+            _join_draining(encoder, eq)
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+        if conn.in_transaction:
+            conn.rollback()
+        if rebuild_indexes:
+            create_embedding_indexes(conn)
             conn.commit()
-            total_done += len(rows)
+        conn.execute("PRAGMA optimize")
+        conn.close()
 
     return {"embedded": total_done, "model": model_name, "db": db_path}
+
+def _batched(rows: Iterator[Tuple[str, str, str]],
+             batch_size: int) -> Iterator[Tuple[List[str], List[str], List[str]]]:
+    ids: List[str] = []
+    texts: List[str] = []
+    hashes: List[str] = []
+    for cid, text, h in rows:
+        ids.append(cid)
+        texts.append(text)
+        hashes.append(h)
+        if len(ids) == batch_size:
+            yield ids, texts, hashes
+            ids, texts, hashes = [], [], []
+    if ids:
+        yield ids, texts, hashes
+
+def _init_worker(model_name: str, device: str | None, dtype: str | None, threads: int) -> None:
+    global _WORKER_EMB
+    import torch
+    torch.set_num_threads(threads)
+    _WORKER_EMB = Embedder(model_name=model_name, device=device, dtype=dtype)
+
+def _encode_in_worker(ids: List[str], texts: List[str], hashes: List[str],
+                      batch_size: int) -> Tuple[List[str], List[str], np.ndarray]:
+    return ids, hashes, _WORKER_EMB.encode(texts, batch_size=batch_size)
+
+def _encode_pooled(executor: ProcessPoolExecutor, batches: Iterator[Tuple[List[str], List[str], List[str]]],
+                   batch_size: int, max_pending: int) -> Iterator[Tuple[List[str], List[str], np.ndarray]]:
+    """Yield (ids, text hashes, vecs) in completion order, keeping at most max_pending batches in flight."""
+    pending = set()
+    for ids, texts, hashes in batches:
+        pending.add(executor.submit(_encode_in_worker, ids, texts, hashes, batch_size))
+        if len(pending) >= max_pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+    for future in as_completed(pending):
+        yield future.result()
+
+def _produce_batches(db_path: str, model: str, batch_size: int, fetch_size: int,
+                     q: queue.Queue, stop: threading.Event) -> None:
+    """Reader thread: stream batches into q, then None (or the exception that stopped it)."""
+    try:
+        uri = Path(db_path).resolve().as_uri() + "?mode=ro"
+        ro = sqlite3.connect(uri, uri=True)
+        try:
+            for batch in _batched(iter_chunks_to_embed(ro, model, fetch_size), batch_size):
+                if stop.is_set():
+                    return
+                q.put(batch)
+        finally:
+            ro.close()
+    except BaseException as e:
+        q.put(e)
+        return
+    q.put(None)
+
+def _run_ahead(items: Iterator, q: queue.Queue, stop: threading.Event) -> None:
+    """Worker thread: move items into q, then None (or the exception that stopped it)."""
+    try:
+        for item in items:
+            if stop.is_set():
+                return
+            q.put(item)
+    except BaseException as e:
+        q.put(e)
+        return
+    q.put(None)
+
+def _join_draining(thread: threading.Thread, q: queue.Queue) -> None:
+    # keep emptying q so a thread blocked on put() can see the stop flag
+    while thread.is_alive():
+        try:
+            q.get_nowait()
+        except queue.Empty:
+            thread.join(0.1)
+
+def _put_sentinel(q: queue.Queue) -> None:
+    # the producer may have refilled q just before exiting; batches still queued
+    # at shutdown are discarded, since put_nowait raising queue.Full here would
+    # mask the original error and skip the rest of the cleanup
+    while True:
+        try:
+            q.put_nowait(None)
+            return
+        except queue.Full:
+            try:
+                q.get_nowait()
+            except queue.Empty:
+                pass
+
+def _drain(q: queue.Queue) -> Iterator[Tuple]:
+    while (item := q.get()) is not None:
+        if isinstance(item, BaseException):
+            raise item
+        yield item
@@ -8,6 +8,13 @@ def main():
     p.add_argument("--model", default="BAAI/bge-small-en-v1.5", help="HF embedding model id")
     p.add_argument("--batch-size", type=int, default=64)
     p.add_argument("--limit-per-pass", type=int, default=5000)
+    p.add_argument("--store-dtype", default="float32", choices=["float32", "float16", "int8-sym"],
+                   help="BLOB layout for stored vectors (float16: 2x smaller, int8-sym: ~4x smaller)")
+    p.add_argument("--int8", action="store_true", help="Shorthand for --store-dtype int8-sym")
+    p.add_argument("--device", default=None, help="cpu, cuda, cuda:N or auto (default: cpu)")
+    p.add_argument("--dtype", default=None, choices=["float32", "float16", "bfloat16", "fp32", "fp16", "bf16"],
+                   help="Inference precision (default: float16 on cuda, float32 on cpu)")
+    p.add_argument("--workers", type=int, default=1, help="CPU model replicas in a process pool (default: 1)")
     args = p.parse_args()
 
     stats = compute_embeddings(
@@ -15,6 +22,10 @@ def main():
         model_name=args.model,
         batch_size=args.batch_size,
         limit_per_pass=args.limit_per_pass,
+        store_dtype="int8-sym" if args.int8 else args.store_dtype,
+        device=args.device,
+        dtype=args.dtype,
+        workers=args.workers,
     )
     print(f"Embedded {stats['embedded']} chunks with {stats['model']} -> {stats['db']}")
 
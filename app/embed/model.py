@@ -1,35 +1,89 @@
 # app/embed/model.py
 from __future__ import annotations
+import logging
+import os
+from pathlib import Path
 from typing import List
 import numpy as np
 from sentence_transformers import SentenceTransformer
 
+logger = logging.getLogger(__name__)
+
+# "torch" (default), "onnx", or "onnx-int8" (dynamically quantized ONNX, CPU only)
+DEFAULT_BACKEND = "torch"
+# where onnx-int8 keeps its one-time quantized export
+ONNX_CACHE_DIR = os.getenv("EMBED_ONNX_CACHE", str(Path.home() / ".cache" / "agentic_rag" / "onnx"))
+_ONNX_INT8_FILE = "onnx/model_qint8_avx2.onnx"
+# short precision names accepted for dtype
+_DTYPE_ALIASES = {"fp32": "float32", "fp16": "float16", "half": "float16", "bf16": "bfloat16"}
+
 class Embedder:
     """
     Thin wrapper so we can swap models later.
     """
 
-    def __init__(self, model_name: str = "BAAI/bge-small-en-v1.5", device: str|None = None, normalize: bool = True):
+    def __init__(self, model_name: str = "BAAI/bge-small-en-v1.5", device: str|None = None, normalize: bool = True,
+                 dtype: str|None = None, backend: str|None = None):
+        """
+        device: torch device, "cpu" when unset ("auto" picks cuda when available).
+        dtype: inference precision ("float16"/"fp16", "bfloat16"/"bf16", "float32"/"fp32");
+            unset means float16 on cuda, float32 otherwise.
+        backend: "torch", "onnx" or "onnx-int8" (default: EMBED_BACKEND env or torch). The ONNX
+        backends run through onnxruntime (pip install sentence-transformers[onnx]) and ignore dtype.
+        Vectors returned by encode are float32 either way.
+        """
         self.model_name = model_name
-        # self.model = SentenceTransformer(model_name, device=device or ("cuda" if _has_cuda() else "cpu"))
-        self.model = SentenceTransformer(model_name, device="cpu")
-        print(self.model)
+        if device == "auto":
+            device = "cuda" if _has_cuda() else "cpu"
+        self.device = device or "cpu"
+        self.backend = backend or os.getenv("EMBED_BACKEND", DEFAULT_BACKEND)
+        if self.backend == "torch":
+            self.model = SentenceTransformer(model_name, device=self.device)
+        elif self.backend == "onnx":
+            self.model = SentenceTransformer(model_name, device=self.device, backend="onnx")
+        elif self.backend == "onnx-int8":
+            self.model = _load_onnx_int8(model_name, self.device)
+        else:
+            raise ValueError(f"Unknown embedding backend: {self.backend}")
+        dtype = _DTYPE_ALIASES.get(dtype, dtype)
+        if self.backend != "torch":
+            dtype = None
+        elif dtype is None and self.device.startswith("cuda"):
+            dtype = "float16"
+        if dtype and dtype != "float32":
+            import torch
+            # half precision halves weight/activation bandwidth; recall loss is negligible for bge-class models
+            self.model.to(getattr(torch, dtype))
+        self.dtype = dtype or "float32"
         self.normalize = normalize
         #cache dim
         self.dim = self.model.get_sentence_embedding_dimension()
-        print(self.dim)
+        logger.debug("Loaded %s (%s, %s, dim=%s)", model_name, self.backend, self.device, self.dim)
 
     def encode(self, texts: List[str], batch_size: int = 64) -> np.ndarray:
+        # SentenceTransformer.encode already length-sorts texts into batches (and restores
+        # input order), so padding waste is handled there; no extra sort here.
         vecs = self.model.encode(
             texts,
             batch_size=batch_size,
             show_progress_bar=False,
             normalize_embeddings=self.normalize,
+            convert_to_numpy=True,
         )
-
-        arr = np.asarray(vecs, dtype=np.float32)
-        return arr
+        # no copy for float32 output; only half-precision models pay a cast
+        return np.asarray(vecs, dtype=np.float32)
     
+def _load_onnx_int8(model_name: str, device: str) -> SentenceTransformer:
+    """Load the int8 ONNX export of model_name, quantizing and caching it on first use."""
+    local = Path(ONNX_CACHE_DIR) / model_name.replace("/", "__")
+    if not (local / _ONNX_INT8_FILE).exists():
+        from sentence_transformers import export_dynamic_quantized_onnx_model
+        fp32 = SentenceTransformer(model_name, device="cpu", backend="onnx")
+        fp32.save(str(local))
+        export_dynamic_quantized_onnx_model(fp32, "avx2", str(local))
+    return SentenceTransformer(str(local), device=device, backend="onnx",
+                               model_kwargs={"file_name": _ONNX_INT8_FILE})
+
 def _has_cuda() -> bool:
     try:
         import torch
@@ -1,29 +1,29 @@
 # app/embed/store.py
 from __future__ import annotations
 import sqlite3, time, hashlib, numpy as np
-from typing import Iterable, Tuple, Optional, List
-
-EMB_SCHEMA = """
-CREATE TABLE IF NOT EXISTS embeddings(
-  chunk_id TEXT PRIMARY KEY,
-  dim INTEGER NOT NULL,
-  vec BLOB NOT NULL,
-  model TEXT NOT NULL,
-  text_sha256 TEXT NOT NULL,
-  created_at INTEGER,
-  FOREIGN KEY(chunk_id) REFERENCES chunks(id)
-);
-CREATE INDEX IF NOT EXISTS idx_embeddings_model ON embeddings(model);
-"""
+from typing import Iterable, Iterator, Tuple, Optional, List
+
+# vec BLOB layouts, recorded in embeddings.dtype
+DTYPE_FLOAT32 = "float32"    # float32[dim]
+DTYPE_FLOAT16 = "float16"    # float16[dim], half the bytes at ~1e-3 relative error
+DTYPE_INT8_SYM = "int8-sym"  # float32 scale + int8[dim], symmetric per-row
 
-def init_embedding_table(conn: sqlite3.Connection):
-    conn.executescript(EMB_SCHEMA)
+# The embeddings table is defined once, in app.corpus.schema (init_db):
+# one row per (chunk_id, model), with text_sha256/created_at/dtype migrated in.
 
 def sha256_text(s: str) -> str:
     h = hashlib.sha256()
     h.update(s.encode("utf-8", errors="ignore"))
     return h.hexdigest()
 
+def sha256_texts(texts: List[str]) -> List[str]:
+    """
+    Batch form of sha256_text: one comprehension per batch instead of a Python call per row.
+    Same hex digests, so stored text_sha256 values still match.
+    """
+    sha256 = hashlib.sha256
+    return [sha256((t or "").encode("utf-8", errors="ignore"), usedforsecurity=False).hexdigest() for t in texts]
+
 def to_blob(arr: np.ndarray) -> bytes:
     assert arr.dtype == np.float32 and arr.ndim == 1
     return arr.tobytes(order="C")
@@ -31,49 +31,130 @@ def to_blob(arr: np.ndarray) -> bytes:
 def from_blob(b: bytes, dim: int) -> np.ndarray:
     return np.frombuffer(b, dtype=np.float32, count=dim)
 
-def fetch_chunks_to_embed(
+def quantize_int8(vecs: np.ndarray) -> np.ndarray:
+    """
+    Symmetric per-row int8 quantization of an (n, dim) float matrix.
+    Returns an (n, 4 + dim) int8 matrix whose rows are int8-sym blobs:
+    the float32 scale (amax / 127) followed by the int8 codes. 4x smaller than float32.
+    """
+    vecs = np.asarray(vecs, dtype=np.float32)
+    amax = np.abs(vecs).max(axis=1, keepdims=True)
+    scale = np.where(amax > 0, amax / 127.0, 1.0).astype(np.float32)
+    q = np.clip(np.round(vecs / scale), -127, 127).astype(np.int8)
+    return np.hstack([scale.view(np.int8), q])
+
+def encode_vectors(vecs: np.ndarray, dtype: str = DTYPE_FLOAT32) -> np.ndarray:
+    """Convert an (n, dim) float32 matrix to the row layout of `dtype`, ready for tobytes()."""
+    if dtype == DTYPE_FLOAT32:
+        return np.ascontiguousarray(vecs, dtype=np.float32)
+    if dtype == DTYPE_FLOAT16:
+        return np.ascontiguousarray(vecs, dtype=np.float16)
+    if dtype == DTYPE_INT8_SYM:
+        return quantize_int8(vecs)
+    raise ValueError(f"Unknown embedding dtype: {dtype}")
+
+def dequantize(b: bytes, dim: int, dtype: Optional[str] = None) -> np.ndarray:
+    """
+    Decode a vec BLOB in the given embeddings.dtype layout to float32[dim].
+    Pass the stored dtype: lengths can collide across layouts (4*dim float32 equals
+    4+dim' int8-sym for some dims). dtype=None (legacy NULL column) falls back to
+    guessing from the length.
+    """
+    if dtype is None:
+        dtype = _sniff_dtype(len(b), dim)
+    if dtype == DTYPE_FLOAT32:
+        return np.frombuffer(b, dtype=np.float32, count=dim)
+    if dtype == DTYPE_FLOAT16:
+        return np.frombuffer(b, dtype=np.float16, count=dim).astype(np.float32)
+    if dtype == DTYPE_INT8_SYM:
+        scale = np.frombuffer(b, dtype=np.float32, count=1)[0]
+        return np.frombuffer(b, dtype=np.int8, count=dim, offset=4).astype(np.float32) * scale
+    raise ValueError(f"Unknown embedding dtype: {dtype}")
+
+def _sniff_dtype(n: int, dim: int) -> str:
+    # legacy rows without a dtype: guess the layout from the blob length
+    if n == 4 * dim:
+        return DTYPE_FLOAT32
+    if n == 2 * dim:
+        return DTYPE_FLOAT16
+    return DTYPE_INT8_SYM
+
+def dtype_column(conn: sqlite3.Connection) -> str:
+    """SELECT expression for embeddings.dtype: the column, or NULL on databases predating it."""
+    cols = {r[1] for r in conn.execute("PRAGMA table_info(embeddings)")}
+    return "dtype" if "dtype" in cols else "NULL AS dtype"
+
+def from_blobs(blobs: List[bytes], dim: int, dtypes: Optional[List[Optional[str]]] = None) -> np.ndarray:
+    """
+    Decode many vec BLOBs straight into one preallocated (n, dim) float32 matrix.
+    dtypes holds each row's embeddings.dtype (None entries, or no list, fall back to
+    length sniffing). Float32 rows are copied once, from the blob buffer into their
+    row; other layouts go through dequantize. No per-row array list to vstack afterwards.
+    """
+    out = np.empty((len(blobs), dim), dtype=np.float32)
+    if dtypes is None:
+        dtypes = [None] * len(blobs)
+    for i, (b, dtype) in enumerate(zip(blobs, dtypes)):
+        if dtype is None:
+            dtype = _sniff_dtype(len(b), dim)
+        if dtype == DTYPE_FLOAT32:
+            out[i] = np.frombuffer(b, dtype=np.float32, count=dim)
+        else:
+            out[i] = dequantize(b, dim, dtype)
+    return out
+
+# Candidate rows for (re)embedding; rows without chunks.text_sha256 are settled in Python
+_TO_EMBED_SQL = """
+    FROM chunks c
+    LEFT JOIN embeddings e ON e.chunk_id = c.id AND e.model = ?
+    WHERE c.text_sha256 IS NULL OR e.text_sha256 IS NULL OR e.text_sha256 <> c.text_sha256
+"""
+
+def count_chunks_to_embed(conn: sqlite3.Connection, model: str) -> int:
+    """Upper bound on the rows iter_chunks_to_embed yields (unhashed chunks may turn out current)."""
+    return conn.execute(f"SELECT count(*) {_TO_EMBED_SQL}", (model,)).fetchone()[0]
+
+def iter_chunks_to_embed(
     conn: sqlite3.Connection,
     model: str,
-    limit: int = 1000,
-) -> List[Tuple[str, str]]:
+    fetch_size: int = 1000,
+) -> Iterator[Tuple[str, str, str]]:
     """
-    Returns list of (chunk_id, text) where embedding is missing or stale for the given model.
-    Logic: if there is no row in embeddings for chunk_id with same model and matching text_sha256 -> needs (re)compute.
+    Streams (chunk_id, text, text_sha256) for every chunk whose embedding is missing or stale for the given model:
+    no row for (chunk_id, model), or a stored text_sha256 that differs from the chunk text's.
+    Walks the whole table with fetchmany. The hash is the one stored with the new
+    embedding, so writers need not hash the text again.
+    Chunks carrying chunks.text_sha256 are compared in SQL, so unchanged rows never reach
+    Python; only rows without a stored hash are hashed here.
     """
-    # join chunks with embeddings on chunk_id & model, compare text_sha256 later in Python for clarity
-    rows = conn.execute("""
-        SELECT c.id, c.text, e.text_sha256, e.model
-        FROM chunks c
-        LEFT JOIN embeddings e ON e.chunk_id = c.id AND e.model = ?
-        LIMIT ?;
-    """, (model, limit)).fetchall()
-
-    todo = []
-    for cid, text, emb_hash, emb_model in rows:
-        t_hash = sha256_text(text or "")
-        # print(emb_hash, t_hash)
-        # print(emb_hash != t_hash)
-        # print(emb_model, model)
-        if emb_hash is None or emb_model != model or emb_hash != t_hash:
-            print("0--------")
-            todo.append((cid, text))
-    print("to doooooo", todo)
-    return todo
+    cur = conn.execute(f"SELECT c.id, c.text, c.text_sha256, e.text_sha256 {_TO_EMBED_SQL}", (model,))
+    while rows := cur.fetchmany(fetch_size):
+        unhashed = [r[1] for r in rows if r[2] is None]
+        hashes = iter(sha256_texts(unhashed))
+        for cid, text, t_hash, emb_hash in rows:
+            if t_hash is None:
+                t_hash = next(hashes)
+            if emb_hash is None or emb_hash != t_hash:
+                yield cid, text, t_hash
 
 def upsert_embeddings(
     conn: sqlite3.Connection,
     model: str,
     dim: int,
-    batch: List[Tuple[str, np.ndarray, str]],
+    batch: List[Tuple[str, np.ndarray | bytes | memoryview, str]],
+    dtype: str = DTYPE_FLOAT32,
 ):
     """
     batch: list of (chunk_id, vec, text_sha256)
+    vec may be a float32 ndarray or an already-serialized buffer (bytes/memoryview) in `dtype` layout.
     """
     now = int(time.time())
     conn.executemany(
-        """INSERT INTO embeddings(chunk_id, dim, vec, model, text_sha256, created_at)
-           VALUES(?,?,?,?,?,?)
-           ON CONFLICT(chunk_id) DO UPDATE SET
-             dim=excluded.dim, vec=excluded.vec, model=excluded.model, text_sha256=excluded.text_sha256, created_at=excluded.created_at;""",
-        [(cid, dim, to_blob(vec), model, th, now) for (cid, vec, th) in batch]
+        """INSERT INTO embeddings(chunk_id, dim, vec, model, text_sha256, created_at, dtype)
+           VALUES(?,?,?,?,?,?,?)
+           ON CONFLICT(chunk_id, model) DO UPDATE SET
+             dim=excluded.dim, vec=excluded.vec, text_sha256=excluded.text_sha256,
+             created_at=excluded.created_at, dtype=excluded.dtype;""",
+        [(cid, dim, to_blob(vec) if isinstance(vec, np.ndarray) else vec, model, th, now, dtype)
+         for (cid, vec, th) in batch]
     )
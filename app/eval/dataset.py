@@ -1,14 +1,28 @@
 from __future__ import annotations
-from typing import List, Dict, Any
+import copy
+import os
+from functools import lru_cache
+from typing import List, Dict, Any, Tuple
 import yaml
 
+try:  # LibYAML C loader when PyYAML was built with it
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
 def load_dataset(path: str) -> List[Dict[str, Any]]:
+    # keyed on mtime so an edited file is re-read; callers get their own deep copy,
+    # so mutating nested gold/rule lists can't leak into later loads
+    return copy.deepcopy(list(_load_items(path, os.path.getmtime(path))))
+
+@lru_cache(maxsize=8)
+def _load_items(path: str, mtime: float) -> Tuple[Dict[str, Any], ...]:
     with open(path, "r", encoding="utf-8") as f:
-        y = yaml.safe_load(f)
+        y = yaml.load(f, Loader=_Loader)
     items = y.get("items", [])
     assert isinstance(items, list) and items, "Dataset has no items"
     # minimal normalization
     for it in items:
         it.setdefault("gold_citations", [])
         it.setdefault("notes", "")
-    return items
+    return tuple(items)
@@ -1,33 +1,44 @@
 from __future__ import annotations
-from typing import List, Dict, Any, Tuple
-import math, numpy as np
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
+import math, re, numpy as np
 from sentence_transformers import CrossEncoder
 from app.embed.model import Embedder
 
 def cosine_sim(a: np.ndarray, b: np.ndarray) -> float:
-    a = a / (np.linalg.norm(a) + 1e-8)
-    b = b / (np.linalg.norm(b) + 1e-8)
-    return float((a @ b))
+    # vdot is a plain BLAS dot; norm() adds dispatch and two temporaries per call
+    denom = math.sqrt(float(np.vdot(a, a)) * float(np.vdot(b, b))) + 1e-8
+    return float(np.dot(a, b) / denom)
 
-def embed_texts(texts: List[str], model: str = "BAAI/bge-small-en-v1.5") -> np.ndarray:
-    emb = Embedder(model_name=model)
-    return emb.encode(texts, batch_size=64)
+# One loaded model per name per process: an eval run scores many items with the same model
+@lru_cache(maxsize=4)
+def get_embedder(model: str = "BAAI/bge-small-en-v1.5") -> Embedder:
+    return Embedder(model_name=model)
+
+def embed_texts(texts: List[str], model: str = "BAAI/bge-small-en-v1.5",
+                embedder: Optional[Embedder] = None) -> np.ndarray:
+    return (embedder or get_embedder(model)).encode(texts, batch_size=64)
 
 def retrieval_labels(hits: List[Dict], gold_rules: List[Dict]) -> List[int]:
     """Return binary relevance per hit using weak gold rules."""
+    # A hit is relevant if any rule matches, so rules flatten into one needle list per field,
+    # lowercased once rather than per hit.
+    chunk_ids = [r["chunk_id"] for r in gold_rules if "chunk_id" in r]
+    paths = [r["path_contains"].lower() for r in gold_rules if "path_contains" in r]
+    secs = [r["section_contains"].lower() for r in gold_rules if "section_contains" in r]
+    texts = [r["text_contains"].lower() for r in gold_rules if "text_contains" in r]
     labs = []
     for h in hits:
-        ok = False
-        t = (h.get("text") or "").lower()
-        sec = (h.get("section") or "").lower()
-        path = (h.get("path") or "").lower()
-        cid = h.get("chunk_id")
-        for r in gold_rules:
-            if "chunk_id" in r and r["chunk_id"] == cid: ok = True
-            if "path_contains" in r and r["path_contains"].lower() in path: ok = True
-            if "section_contains" in r and r["section_contains"].lower() in sec: ok = True
-            if "text_contains" in r and r["text_contains"].lower() in t: ok = True
-            if ok: break
+        ok = h.get("chunk_id") in chunk_ids
+        if not ok and paths:
+            path = (h.get("path") or "").lower()
+            ok = any(n in path for n in paths)
+        if not ok and secs:
+            sec = (h.get("section") or "").lower()
+            ok = any(n in sec for n in secs)
+        if not ok and texts:
+            t = (h.get("text") or "").lower()
+            ok = any(n in t for n in texts)
         labs.append(1 if ok else 0)
     return labs
 
@@ -36,42 +47,76 @@ def recall_at_k(labels: List[int], k: int=5) -> float:
 
 def mrr(labels: List[int], k: int=10) -> float:
     if not labels: return 0.0
-    for i, l in enumerate(labels[:k], start=1):
-        if l == 1: return 1.0 / i
-    return 0.0
+    try:
+        return 1.0 / (labels.index(1, 0, k) + 1)
+    except ValueError:
+        return 0.0
+
+# DCG discounts 1/log2(rank+1) for ranks 1..1024, computed once
+_NDCG_DISCOUNTS = tuple(1.0 / math.log2(i + 2) for i in range(1024))
 
 def ndcg(labels: List[int], k: int=10) -> float:
     # binary gains; DCG with log2 discount
-    gains = [l for l in labels[:k]]
-    dcg = sum(g / math.log2(i+2) for i, g in enumerate(gains))
+    gains = labels[:k]
+    discounts = _NDCG_DISCOUNTS if len(gains) <= len(_NDCG_DISCOUNTS) else [1.0 / math.log2(i + 2) for i in range(len(gains))]
+    dcg = sum(g * d for g, d in zip(gains, discounts) if g)
     # ideal DCG: one relevant at rank 1 (binary)
     idcg = 1.0
     return float(dcg / idcg) if idcg > 0 else 0.0
 
-def answer_similarity(answer: str, gold: str, emb_model="BAAI/bge-small-en-v1.5") -> float:
-    vecs = embed_texts([answer, gold], model=emb_model)
+def answer_similarity(answer: str, gold: str, emb_model="BAAI/bge-small-en-v1.5",
+                      embedder: Optional[Embedder] = None) -> float:
+    vecs = embed_texts([answer, gold], model=emb_model, embedder=embedder)
     return cosine_sim(vecs[0], vecs[1])
 
-def faithfulness_proxy(answer: str, ctx_texts: List[str], emb_model="BAAI/bge-small-en-v1.5") -> float:
+_SENT_SPLIT = re.compile(r'(?<=[.!?])\s+')
+
+def _sentences(answer: str) -> List[str]:
+    return [s.strip() for s in _SENT_SPLIT.split(answer) if s.strip()]
+
+def _support_score(a_vecs: np.ndarray, c_vecs: np.ndarray) -> float:
+    """Mean over answer sentences of the best context cosine, mapped to [0,1]."""
+    # (contexts x sentences) in one GEMM; best-supporting context per sentence
+    c_norms = np.linalg.norm(c_vecs, axis=1) + 1e-8
+    sims = ((c_vecs @ a_vecs.T) / c_norms[:, None]).max(axis=0)
+    # Normalize to [0,1] like cosine
+    sims = (np.clip(sims, -1.0, 1.0) + 1.0) * 0.5
+    return float(sims.mean())
+
+def faithfulness_proxy(answer: str, ctx_texts: List[str], emb_model="BAAI/bge-small-en-v1.5",
+                       embedder: Optional[Embedder] = None) -> float:
     """
     Split answer into sentences; each sentence must be supported by some context chunk.
     Score = mean(max_cosine_per_sentence).
     """
-    import re
-    sents = [s.strip() for s in re.split(r'(?<=[.!?])\s+', answer) if s.strip()]
+    sents = _sentences(answer)
     if not sents or not ctx_texts: return 0.0
-    a_vecs = embed_texts(sents, model=emb_model)
-    c_vecs = embed_texts(ctx_texts, model=emb_model)
-    sims = []
-    for i in range(a_vecs.shape[0]):
-        sims.append(float(np.max(c_vecs @ a_vecs[i] / (np.linalg.norm(c_vecs, axis=1)+1e-8) )))
-    # Normalize to [0,1] like cosine
-    sims = [(s+1)/2 if -1 <= s <= 1 else max(0.0, min(1.0, s)) for s in sims]
-    return float(sum(sims)/len(sims))
+    # one encode call for both sets, then split
+    vecs = embed_texts(sents + list(ctx_texts), model=emb_model, embedder=embedder)
+    return _support_score(vecs[:len(sents)], vecs[len(sents):])
+
+def answer_metrics(answer: str, gold: str, ctx_texts: List[str], emb_model="BAAI/bge-small-en-v1.5",
+                   embedder: Optional[Embedder] = None) -> Tuple[float, float]:
+    """
+    (answer_similarity, faithfulness_proxy) from a single encode of
+    [answer, gold] + answer sentences + contexts. answer_similarity is 0.0 without gold.
+    """
+    sents = _sentences(answer)
+    ctx = list(ctx_texts) if sents else []
+    head = [answer, gold] if gold else []
+    texts = head + (sents + ctx if ctx else [])
+    if not texts:
+        return 0.0, 0.0
+    vecs = embed_texts(texts, model=emb_model, embedder=embedder)
+    a_sim = cosine_sim(vecs[0], vecs[1]) if gold else 0.0
+    n = len(head)
+    faithful = _support_score(vecs[n:n + len(sents)], vecs[n + len(sents):]) if ctx else 0.0
+    return a_sim, faithful
 
 def citation_alignment(pred_citations: List[Dict], retrieved_ids: List[str]) -> float:
     if not pred_citations: return 0.0
     pred_ids = [c.get("chunk_id") for c in pred_citations if c.get("chunk_id")]
     if not pred_ids: return 0.0
-    hits = sum(1 for cid in pred_ids if cid in retrieved_ids)
+    retrieved = set(retrieved_ids)
+    hits = sum(1 for cid in pred_ids if cid in retrieved)
     return hits / max(1, len(pred_ids))
@@ -1,5 +1,6 @@
 from __future__ import annotations
-import argparse, json, csv
+import argparse, json, csv, threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List
 
 from app.eval.dataset import load_dataset
@@ -11,9 +12,14 @@ from app.qa.answer import answer_question
 from app.llm.hf import HFGenerator
 from app.eval.metrics import (
     retrieval_labels, recall_at_k, mrr, ndcg,
-    answer_similarity, faithfulness_proxy, citation_alignment
+    answer_metrics, citation_alignment, get_embedder
 )
 
+# Items evaluated concurrently. Serial by default: run_eval generates with the local
+# HFGenerator, and concurrent generate() calls on one model contend for the same
+# device and memory. Raise it for generators that are remote or safe to share.
+DEFAULT_EVAL_WORKERS = 1
+
 def run_eval(
     dataset_path: str,
     db_path: str = "rag_local.db",
@@ -24,64 +30,46 @@ def run_eval(
     rrf_k: int = 60,
     rerank: bool = True,
     rerank_k: int = 20,
+    workers: int = DEFAULT_EVAL_WORKERS,
 ) -> Dict[str, Any]:
     items = load_dataset(dataset_path)
     vs = VectorSearcher(db_path=db_path, model_name=emb_model)
     bs = BM25Searcher(db_path=db_path)
     hs = HybridSearcher(vs, bs, db_path=db_path)
     gen = HFGenerator()
+    # loaded once and passed to every metric call; the vector searcher already holds emb_model
+    embedder = getattr(vs, "embedder", None) or get_embedder(emb_model)
+    search_kw = dict(k_vector=k_vector, k_bm25=k_bm25, rrf_k=rrf_k, rerank=rerank, rerank_k=rerank_k)
+
+    # one read-only connection per worker thread (sqlite3 connections are thread-bound),
+    # reused across that thread's items so its statement cache stays warm
+    local = threading.local()
+    conns: List[Any] = []
+    conns_lock = threading.Lock()
+
+    def thread_conn():
+        conn = getattr(local, "conn", None)
+        if conn is None:
+            conn = local.conn = connect(db_path)
+            conn.execute("PRAGMA query_only = 1")
+            conn.execute("PRAGMA mmap_size = 268435456")
+            with conns_lock:
+                conns.append(conn)
+        return conn
 
-    rows: List[Dict[str, Any]] = []
-
-    for it in items:
-        qid = it["id"]; q = it["question"]
-        gold = it.get("gold_answer","")
-        gold_rules = it.get("gold_citations", [])
-
-        # 1) retrieval pass
-        hits = hs.search(
-            q, top_k=max(top_k_ctx, 10),
-            k_vector=k_vector, k_bm25=k_bm25, rrf_k=rrf_k,
-            rerank=rerank, rerank_k=rerank_k
-        )
-        retrieved_ids = [h["chunk_id"] for h in hits]
-        labels = retrieval_labels(hits, gold_rules)
-        r_at5 = recall_at_k(labels, k=5)
-        r_at10 = recall_at_k(labels, k=10)
-        mrr10 = mrr(labels, k=10)
-        ndcg10 = ndcg(labels, k=10)
-
-        conn = connect(db_path)
-        full_map = fetch_full_chunks(conn, retrieved_ids[:top_k_ctx])
-        conn.close()
-        ctx_texts = [full_map.get(cid,"") for cid in retrieved_ids[:top_k_ctx]]
-
-        # 2) grounded answer
-        payload = answer_question(
-            q, hs, gen,
-            top_k_ctx=top_k_ctx, k_vector=k_vector, k_bm25=k_bm25, rrf_k=rrf_k,
-            rerank=rerank, rerank_k=rerank_k
-        )
-        ans = payload.answer
-        cites = [c.dict() for c in payload.citations]
-
-        # 3) metrics
-        a_sim = answer_similarity(ans, gold, emb_model=emb_model) if gold else 0.0
-        faithful = faithfulness_proxy(ans, ctx_texts, emb_model=emb_model)
-        cite_align = citation_alignment(cites, retrieved_ids)
-
-        rows.append({
-            "id": qid,
-            "retrieval_recall@5": round(r_at5, 3),
-            "retrieval_recall@10": round(r_at10, 3),
-            "mrr@10": round(mrr10, 3),
-            "ndcg@10": round(ndcg10, 3),
-            "answer_sim": round(a_sim, 3),
-            "faithfulness": round(faithful, 3),
-            "citation_align": round(cite_align, 3),
-            "confidence": round(payload.confidence, 3),
-            "blocked": bool(payload.safety.blocked),
-        })
+    def process(it: Dict[str, Any]) -> Dict[str, Any]:
+        return _process_item(it, hs, gen, embedder, thread_conn(), top_k_ctx, search_kw)
+
+    try:
+        if workers > 1:
+            # map keeps rows in dataset order
+            with ThreadPoolExecutor(max_workers=workers) as ex:
+                rows = list(ex.map(process, items))
+        else:
+            rows = [process(it) for it in items]
+    finally:
+        for conn in conns:
+            conn.close()
 
     # summary
     def avg(key): 
@@ -102,6 +90,46 @@ def run_eval(
     }
     return {"rows": rows, "summary": summary}
 
+def _process_item(it, hs, gen, embedder, conn, top_k_ctx: int, search_kw: Dict[str, Any]) -> Dict[str, Any]:
+    qid = it["id"]; q = it["question"]
+    gold = it.get("gold_answer","")
+    gold_rules = it.get("gold_citations", [])
+
+    # 1) retrieval pass
+    hits = hs.search(q, top_k=max(top_k_ctx, 10), **search_kw)
+    retrieved_ids = [h["chunk_id"] for h in hits]
+    labels = retrieval_labels(hits, gold_rules)
+    r_at5 = recall_at_k(labels, k=5)
+    r_at10 = recall_at_k(labels, k=10)
+    mrr10 = mrr(labels, k=10)
+    ndcg10 = ndcg(labels, k=10)
+
+    full_map = fetch_full_chunks(conn, retrieved_ids[:top_k_ctx])
+    ctx_texts = [full_map.get(cid,"") for cid in retrieved_ids[:top_k_ctx]]
+
+    # 2) grounded answer
+    payload = answer_question(q, hs, gen, top_k_ctx=top_k_ctx, **search_kw)
+    ans = payload.answer
+    cites = [c.model_dump() for c in payload.citations]
+
+    # 3) metrics
+    # similarity and faithfulness share one encode batch
+    a_sim, faithful = answer_metrics(ans, gold, ctx_texts, embedder=embedder)
+    cite_align = citation_alignment(cites, retrieved_ids)
+
+    return {
+        "id": qid,
+        "retrieval_recall@5": round(r_at5, 3),
+        "retrieval_recall@10": round(r_at10, 3),
+        "mrr@10": round(mrr10, 3),
+        "ndcg@10": round(ndcg10, 3),
+        "answer_sim": round(a_sim, 3),
+        "faithfulness": round(faithful, 3),
+        "citation_align": round(cite_align, 3),
+        "confidence": round(payload.confidence, 3),
+        "blocked": bool(payload.safety.blocked),
+    }
+
 def main():
     ap = argparse.ArgumentParser(description="Run offline RAG eval.")
     ap.add_argument("--dataset", default="app/eval/samples.yaml")
@@ -113,6 +141,7 @@ def main():
     ap.add_argument("--rrf-k", type=int, default=60)
     ap.add_argument("--rerank", action="store_true")
     ap.add_argument("--rerank-k", type=int, default=20)
+    ap.add_argument("--workers", type=int, default=DEFAULT_EVAL_WORKERS, help="Items evaluated concurrently (1 = serial)")
     ap.add_argument("--out-json", default="eval_results.json")
     ap.add_argument("--out-csv", default="eval_results.csv")
     args = ap.parse_args()
@@ -127,6 +156,7 @@ def main():
         rrf_k=args.rrf_k,
         rerank=args.rerank,
         rerank_k=args.rerank_k,
+        workers=args.workers,
     )
     print(json.dumps(out["summary"], indent=2))
     with open(args.out_json, "w", encoding="utf-8") as f:
@@ -1,8 +1,18 @@
-# app/llm/groq_gen.py
 from __future__ import annotations
 import os
-from typing import List
-from groq import Groq
+from functools import lru_cache
+from typing import AsyncIterator, List, Tuple
+import httpx
+from groq import AsyncGroq, Groq
+
+# Shared keep-alive pool for the async client: one HTTP/2 connection
+# multiplexes many in-flight completions instead of a TLS handshake per call.
+_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=32, max_connections=64)
+
+@lru_cache(maxsize=256)
+def _join_ctx(contexts: Tuple[str, ...]) -> str:
+    # items that retrieve the same chunks reuse the joined block
+    return "\n\n".join(contexts)
 
 class GroqGenerator:
     """
@@ -16,6 +26,26 @@ class GroqGenerator:
         if not self.api_key:
             raise RuntimeError("Missing GROQ_API_KEY in env or passed explicitly")
         self.client = Groq(api_key=self.api_key)
+        # created lazily so it binds to the running event loop
+        self._aclient: AsyncGroq | None = None
+
+    @property
+    def aclient(self) -> AsyncGroq:
+        if self._aclient is None:
+            self._aclient = AsyncGroq(
+                api_key=self.api_key,
+                http_client=httpx.AsyncClient(http2=True, limits=_HTTP_LIMITS),
+            )
+        return self._aclient
+
+    @staticmethod
+    def _messages(prompt: str, contexts: List[str], system: str) -> List[dict]:
+        msgs = [{"role": "system", "content": system}]
+        if contexts:
+            ctx = _join_ctx(tuple(contexts))
+            msgs.append({"role": "user", "content": f"Context:\n{ctx}"})
+        msgs.append({"role": "user", "content": prompt})
+        return msgs
 
     def generate(
         self,
@@ -25,16 +55,52 @@ class GroqGenerator:
         temperature: float = 0.2,
         max_tokens: int = 512,
     ) -> str:
-        msgs = [{"role": "system", "content": system}]
-        if contexts:
-            ctx = "\n\n".join(contexts)
-            msgs.append({"role": "user", "content": f"Context:\n{ctx}"})
-        msgs.append({"role": "user", "content": prompt})
-
         resp = self.client.chat.completions.create(
             model=self.model,
-            messages=msgs,
+            messages=self._messages(prompt, contexts, system),
             temperature=temperature,
             max_tokens=max_tokens,
         )
-        return resp.choices[0].message.content.strip()
\ No newline at end of file
+        return resp.choices[0].message.content.strip()
+
+    async def agenerate(
+        self,
+        prompt: str,
+        contexts: List[str] = [],
+        system: str = "You are a grounded QA assistant.",
+        temperature: float = 0.2,
+        max_tokens: int = 512,
+    ) -> str:
+        """Async variant of `generate` sharing one keep-alive HTTP/2 pool."""
+        resp = await self.aclient.chat.completions.create(
+            model=self.model,
+            messages=self._messages(prompt, contexts, system),
+            temperature=temperature,
+            max_tokens=max_tokens,
+        )
+        return resp.choices[0].message.content.strip()
+
+    async def astream(
+        self,
+        prompt: str,
+        contexts: List[str] = [],
+        system: str = "You are a grounded QA assistant.",
+        temperature: float = 0.2,
+        max_tokens: int = 512,
+    ) -> AsyncIterator[str]:
+        """Yield completion text deltas as Groq streams them."""
+        stream = await self.aclient.chat.completions.create(
+            model=self.model,
+            messages=self._messages(prompt, contexts, system),
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=True,
+        )
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    async def aclose(self) -> None:
+        if self._aclient is not None:
+            await self._aclient.close()
+            self._aclient = None
@@ -1,9 +1,12 @@
-from typing import List
+from functools import lru_cache
+from typing import List, Tuple
 import torch
 from transformers import AutoModelForCausalLM, AutoTokenizer
 from app.config import settings
 
-def _format_prompt(tokenizer, system: str, user: str, contexts: List[str]) -> str:
+# Eval runs and retries re-send identical (system, question, contexts); reuse the rendered template
+@lru_cache(maxsize=256)
+def _format_prompt(tokenizer, system: str, user: str, contexts: Tuple[str, ...]) -> str:
     msgs = []
     if system:
         msgs.append({"role": "system", "content": system})
@@ -18,6 +21,7 @@ def _format_prompt(tokenizer, system: str, user: str, contexts: List[str]) -> st
     
 class HFGenerator:
     def __init__(self):
+        self.model_name = settings.model_name
         self.tokenizer = AutoTokenizer.from_pretrained(settings.model_name, use_fast=True)
         self.model = AutoModelForCausalLM.from_pretrained(
             settings.model_name,
@@ -30,7 +34,7 @@ class HFGenerator:
     def generate(self, prompt: str, contexts: List[str] | None = None, system: str | None = None) -> str:
         system = system or "You are a concise helpful assistant."
         contexts = contexts or []
-        text = _format_prompt(self.tokenizer, system, prompt, contexts)
+        text = _format_prompt(self.tokenizer, system, prompt, tuple(contexts))
         inputs = self.tokenizer(text, return_tensors="pt").to(self.model.device)
         out = self.model.generate(
             **inputs,
@@ -1,11 +1,21 @@
 # app/qa/answer.py
 from __future__ import annotations
-from typing import List, Dict
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import TYPE_CHECKING, List, Dict, Tuple, Any
+import json
+import os
+import re
+import threading
 import time
 
-from app.llm.groq_gen import GroqGenerator  # using Groq now
+if TYPE_CHECKING:
+    # annotation only: any generator with generate(prompt, contexts, system) works, and the
+    # runtime import would pull groq/httpx into processes that answer with HFGenerator
+    from app.llm.groq_gen import GroqGenerator
 from app.qa.prompt import SYSTEM_RULES, make_context_blocks, make_user_prompt
-from app.qa.schema import AnswerPayload
+from app.qa.schema import AnswerPayload, Citation
 
 # Safety
 from app.safety.guard import preflight, postflight
@@ -16,34 +26,121 @@ from app.obs.metrics import GENERATION_LATENCY, TOKENS_INPUT, TOKENS_OUTPUT
 from opentelemetry import trace
 _tracer = trace.get_tracer(__name__)
 
+# Token counters are observability only; they are updated on this pool so the answer
+# returns without waiting on the tokenizer
+_TOK_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="tok-count")
 
-def _normalize(nums: List[float]) -> List[float]:
-    if not nums:
-        return []
-    lo, hi = min(nums), max(nums)
-    if hi - lo < 1e-9:
-        return [1.0 for _ in nums]
-    return [(x - lo) / (hi - lo) for x in nums]
+# Answers to repeated questions (FAQs, dashboards, eval reruns) can be served from memory,
+# skipping retrieval and the LLM call; keyed on the searcher's index/version and the model name.
+# Opt-in: QA_CACHE_TTL=<seconds> enables it, and each entry (one sampled completion) expires
+# after that long even if the index is unchanged. Hits return a deep copy.
+DEFAULT_QA_CACHE_SIZE = 1024
+QA_CACHE_TTL = float(os.getenv("QA_CACHE_TTL", "0"))  # 0 disables the cache
+_QA_CACHE: "OrderedDict[Tuple[Any, ...], Tuple[float, AnswerPayload]]" = OrderedDict()
+_QA_CACHE_LOCK = threading.Lock()
+
+
+# Literal lookups: a quoted phrase, "section: <name>", or a single identifier-like token
+# (4+ chars with a digit or an inner '_', '.', '-', e.g. "s51A", "Part-IVA"; plain words don't qualify)
+_QUOTED = re.compile(r'^\s*["\u201c\'](.+?)["\u201d\']\s*$')
+_SECTION_PREFIX = re.compile(r'^\s*section\s*:\s*(.+?)\s*$', re.IGNORECASE)
+_IDENTIFIER = re.compile(r'^\s*((?=[A-Za-z0-9_.\-]*[0-9_.\-])[A-Za-z][A-Za-z0-9_.\-]{2,}[A-Za-z0-9])\s*$')
+LITERAL_LOOKUP_CONFIDENCE = 0.75
+
+
+def _literal_lookup(question: str) -> str | None:
+    """Return the looked-up literal if the question is an exact-match lookup, else None."""
+    for pat in (_QUOTED, _SECTION_PREFIX, _IDENTIFIER):
+        m = pat.match(question)
+        if m:
+            return m.group(1)
+    return None
+
+
+def _hit_key(h: Dict) -> str:
+    # same key make_context_blocks uses to look bodies up in the sanitized map
+    return h.get("chunk_id") or str(id(h))
+
+
+def _literal_answer(literal: str, hits: List[Dict], sanitized: Dict[str, str]) -> AnswerPayload | None:
+    # answered from the top hit itself when its section or file name contains the literal;
+    # directory components are ignored so a word like "data" can't match every path
+    top = hits[0]
+    needle = literal.casefold()
+    names = ((top.get("section") or ""), os.path.basename(top.get("path") or ""))
+    body = sanitized.get(_hit_key(top), "").strip()  # absent when preflight filtered the chunk
+    if not body or not any(needle in n.casefold() for n in names):
+        return None
+    final_text, blocked, info = _postflight(body)
+    if blocked:
+        return AnswerPayload(
+            answer="I can’t help with that.",
+            citations=[],
+            confidence=0.2,
+            safety={"blocked": True, **info},
+        )
+    citations = _default_citations([top], limit=1)
+    # same STRICT JSON shape the LLM is asked to produce, so /ask parses it unchanged
+    answer = json.dumps({
+        "answer": final_text,
+        "citations": [c.model_dump() for c in citations],
+        "confidence": LITERAL_LOOKUP_CONFIDENCE,
+        "safety": {"blocked": False},
+    }, ensure_ascii=False)
+    return AnswerPayload(
+        answer=answer,
+        citations=citations,
+        confidence=LITERAL_LOOKUP_CONFIDENCE,
+        safety={"blocked": False, "literal_lookup": True},
+    )
+
+
+def _postflight(text: str) -> Tuple[str, bool, Dict]:
+    # answer-side safety pass shared by the LLM and literal-lookup paths
+    try:
+        return postflight(text, policy=DEFAULT_POLICY)
+    except Exception:
+        return text, False, {}
 
 
 def _confidence_from_hits(hits: List[Dict]) -> float:
-    base = [h.get("score", 0.0) for h in hits]
-    if not base:
+    top = [float(h.get("score", 0.0)) for h in hits[:5]]
+    if not top:
         return 0.35
-    norm_top = _normalize([float(x) for x in base[:5]])
-    raw = sum(norm_top) / max(1, len(norm_top))
+    lo, hi = min(top), max(top)
+    # mean of min-max normalized scores == (mean - lo) / (hi - lo); all-equal scores count as 1.0
+    raw = 1.0 if hi - lo < 1e-9 else (sum(top) / len(top) - lo) / (hi - lo)
     return max(0.35, min(0.90, 0.35 + 0.55 * raw))
 
 
-def _default_citations(hits: List[Dict], limit: int = 5) -> List[Dict]:
-    cites: List[Dict] = []
-    for h in hits[:limit]:
-        cites.append({
-            "source": h.get("source"),
-            "path": h.get("path"),
-            "section": h.get("section"),
-        })
-    return cites
+def _default_citations(hits: List[Dict], limit: int = 5) -> List[Citation]:
+    # built from our own hit dicts, so skip validation; AnswerPayload keeps the instances as-is
+    return [
+        Citation.model_construct(
+            chunk_id=h.get("chunk_id"), source=h.get("source"), path=h.get("path"), section=h.get("section"),
+        )
+        for h in hits[:limit]
+    ]
+
+
+@lru_cache(maxsize=4)
+def _system_token_count(tok, system: str) -> int:
+    # the system rules are constant per deployment; tokenize them once per tokenizer
+    return len(tok(system, add_special_tokens=False)["input_ids"])
+
+
+def _count_tokens(tok, system: str, prompt_parts: List[str], output_text: str | None) -> None:
+    # one batched tokenizer call per request for both counters; prompt pieces are
+    # tokenized separately and summed rather than joined into one large string
+    try:
+        texts = prompt_parts if output_text is None else [*prompt_parts, output_text]
+        ids = tok(texts, add_special_tokens=False, padding=False)["input_ids"]
+        n_prompt = sum(len(x) for x in ids[:len(prompt_parts)])
+        TOKENS_INPUT.inc(_system_token_count(tok, system) + n_prompt)
+        if output_text is not None:
+            TOKENS_OUTPUT.inc(len(ids[-1]))
+    except Exception:
+        pass
 
 
 def answer_question(
@@ -56,7 +153,43 @@ def answer_question(
     """
     Orchestrates: retrieve → guard.preflight → prompt → generate → postflight → validate
     """
+    key = _cache_key(question, top_k_ctx, searcher, generator) if QA_CACHE_TTL > 0 else None
+    if key is not None:
+        with _QA_CACHE_LOCK:
+            cached = _QA_CACHE.get(key)
+            if cached is not None and cached[0] > time.monotonic():
+                _QA_CACHE.move_to_end(key)
+                # callers may mutate the payload; never hand out the stored instance
+                return cached[1].model_copy(deep=True)
+            if cached is not None:
+                del _QA_CACHE[key]
+
+    payload = _answer(question, searcher, generator, top_k_ctx)
 
+    # failed generations (empty answer) and safety blocks are not cached
+    if key is not None and payload.answer and not payload.safety.get("blocked"):
+        with _QA_CACHE_LOCK:
+            _QA_CACHE[key] = (time.monotonic() + QA_CACHE_TTL, payload.model_copy(deep=True))
+            if len(_QA_CACHE) > DEFAULT_QA_CACHE_SIZE:
+                _QA_CACHE.popitem(last=False)
+    return payload
+
+
+def _cache_key(question: str, top_k_ctx: int, searcher, generator) -> Tuple[Any, ...] | None:
+    # stable identity only (object ids can be reused after GC); None disables caching
+    # for searchers without a corpus version or generators without a model name
+    version = getattr(searcher, "version", None)
+    model = getattr(generator, "model_name", None) or getattr(generator, "model", None)
+    if version is None or not isinstance(model, str):
+        return None
+    return (
+        question, top_k_ctx,
+        type(searcher).__name__, getattr(searcher, "index_file", None), getattr(searcher, "db_path", None), version,
+        type(generator).__name__, model,
+    )
+
+
+def _answer(question: str, searcher, generator: GroqGenerator, top_k_ctx: int) -> AnswerPayload:
     # 1) Retrieve candidates (directly from FAISS)
     hits = searcher.search(question, top_k=max(top_k_ctx, 10))
 
@@ -68,8 +201,8 @@ def answer_question(
             safety={"blocked": False},
         )
 
-    # 2) Contexts: just take hit["text"] directly
-    full_map = {i: h["text"] for i, h in enumerate(hits[:top_k_ctx])}
+    # 2) Contexts: just take hit["text"] directly, keyed as make_context_blocks looks them up
+    full_map = {_hit_key(h): h["text"] for h in hits[:top_k_ctx]}
 
     # 3) Safety preflight
     blocked, safety_info, sanitized_full_map = preflight(
@@ -85,18 +218,20 @@ def answer_question(
             safety={"blocked": True, **safety_info},
         )
 
-    # 4) Prompt building
-    context_blocks = make_context_blocks(hits, sanitized_full_map, max_blocks=top_k_ctx)
+    # exact-match lookups are answered from the matching chunk without an LLM call
+    literal = _literal_lookup(question)
+    if literal:
+        payload = _literal_answer(literal, hits, sanitized_full_map)
+        if payload is not None:
+            return payload
+
+    # 4) Prompt building; chunks preflight filtered out stay out of the prompt
+    kept = [h for h in hits[:top_k_ctx] if _hit_key(h) in sanitized_full_map]
+    context_blocks = make_context_blocks(kept, sanitized_full_map, max_blocks=top_k_ctx)
+
     system = SYSTEM_RULES
     user = make_user_prompt(question)
 
-    try:
-        tok = generator.tokenizer
-        inp_tokens = len(tok(system + "\n\n" + "\n\n".join(context_blocks) + "\n\n" + user).input_ids)
-        TOKENS_INPUT.inc(inp_tokens)
-    except Exception:
-        pass
-
     # 5) Generate
     with _tracer.start_as_current_span("generation.llm"):
         t0 = time.perf_counter()
@@ -112,10 +247,11 @@ def answer_question(
                 pass
 
     # 6) Safety postflight
-    try:
-        final_text, blocked2, info2 = postflight(text, policy=DEFAULT_POLICY)
-    except Exception:
-        final_text, blocked2, info2 = text, False, {}
+    final_text, blocked2, info2 = _postflight(text)
+
+    tok = getattr(generator, "tokenizer", None)
+    if tok is not None:
+        _TOK_POOL.submit(_count_tokens, tok, system, [*context_blocks, user], None if blocked2 else final_text)
 
     if blocked2:
         return AnswerPayload(
@@ -128,12 +264,6 @@ def answer_question(
     citations = _default_citations(hits, limit=min(5, top_k_ctx))
     confidence = _confidence_from_hits(hits)
 
-    try:
-        out_tokens = len(generator.tokenizer(final_text).input_ids)
-        TOKENS_OUTPUT.inc(out_tokens)
-    except Exception:
-        pass
-
     return AnswerPayload(
         answer=final_text.strip() if isinstance(final_text, str) else str(final_text),
         citations=citations,
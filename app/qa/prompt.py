@@ -47,13 +47,18 @@ def make_context_blocks(hits: List[Dict], full_texts: Dict[str, str], max_blocks
     Format the top-N results as independent blocks of plain text only.
     Metadata is not embedded here to save tokens; it's handled separately for citations.
     """
-    blocks = []
-    for h in hits[:max_blocks]:
-        cid = h.get("chunk_id") or str(id(h))
-        body = full_texts.get(cid, h.get("text", "")).strip()
-        if body:
-            blocks.append(body)
-    return blocks
+    bodies = (full_texts.get(h.get("chunk_id") or str(id(h)), h.get("text", "")).strip() for h in hits[:max_blocks])
+    return [b for b in bodies if b]
+
+
+_USER_PREFIX = (
+    "Answer the following legal question using ONLY the provided legal context blocks above.\n"
+    "Your response must be in STRICT JSON with keys exactly: answer, citations, confidence, safety.\n"
+    "The 'answer' must always be at least one full paragraph with clear explanation.\n"
+    "If relevant, expand with context, scope, and examples (from the supplied context only).\n"
+    "Do NOT provide personal legal advice, only summarize what the context states.\n\n"
+    "User legal question: "
+)
 
 
 def make_user_prompt(question: str) -> str:
@@ -61,11 +66,4 @@ def make_user_prompt(question: str) -> str:
     Frame the user query as a legal question with instructions to produce 
     detailed JSON-formatted answers.
     """
-    return (
-        "Answer the following legal question using ONLY the provided legal context blocks above.\n"
-        "Your response must be in STRICT JSON with keys exactly: answer, citations, confidence, safety.\n"
-        "The 'answer' must always be at least one full paragraph with clear explanation.\n"
-        "If relevant, expand with context, scope, and examples (from the supplied context only).\n"
-        "Do NOT provide personal legal advice, only summarize what the context states.\n\n"
-        f"User legal question: {question}"
-    )
\ No newline at end of file
+    return _USER_PREFIX + question
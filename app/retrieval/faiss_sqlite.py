@@ -5,6 +5,8 @@ FAISS-based vector search implementation with SQLite metadata storage.
 from __future__ import annotations
 import os
 import logging
+import sqlite3
+import threading
 from typing import List, Dict, Optional
 import faiss
 import numpy as np
@@ -40,7 +42,8 @@ class FaissSqliteSearcher(BaseSearcher):
         self, 
         embedder: Embedder, 
         db_path: str = DEFAULT_DB_PATH,
-        index_file: str = DEFAULT_INDEX_FILE
+        index_file: str = DEFAULT_INDEX_FILE,
+        mmap: bool = True
     ):
         """
         Initialize the FAISS SQLite searcher.
@@ -49,6 +52,7 @@ class FaissSqliteSearcher(BaseSearcher):
             embedder: Embedding model for query encoding
             db_path: Path to SQLite database file
             index_file: Path to FAISS index file
+            mmap: Memory-map the index read-only so worker processes share its pages
             
         Raises:
             FileNotFoundError: If FAISS index file doesn't exist
@@ -57,9 +61,28 @@ class FaissSqliteSearcher(BaseSearcher):
         self.embedder = embedder
         self.db_path = db_path
         self.index_file = index_file
+        self.mmap = mmap
         self.index: Optional[faiss.IndexIDMap] = None
+        self.version: Optional[float] = None
+        # one long-lived read-only connection per serving thread (sqlite3 connections
+        # are thread-bound); keeps the page and statement caches warm across requests
+        self._local = threading.local()
         self._load_faiss_index()
 
+    def _conn(self) -> sqlite3.Connection:
+        """
+        Get this thread's metadata connection, opening it on first use.
+        
+        Returns:
+            Read-only SQLite connection to db_path
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = db_connect(self.db_path)
+            conn.execute("PRAGMA query_only = 1")
+            conn.execute("PRAGMA cache_size = -65536")
+        return conn
+
     def _load_faiss_index(self) -> None:
         """
         Load the FAISS index from disk.
@@ -75,19 +98,35 @@ class FaissSqliteSearcher(BaseSearcher):
             
         try:
             logger.info(f"Loading FAISS index from {self.index_file}")
-            index = faiss.read_index(self.index_file)
+            index = self._read_index()
 
             # Ensure ID support for index.add_with_ids() and search with mapped IDs
             if not isinstance(index, faiss.IndexIDMap):
                 index = faiss.IndexIDMap(index)
 
             self.index = index
+            # identifies the corpus snapshot for answer caches; a rebuilt index changes it
+            self.version = os.path.getmtime(self.index_file)
             logger.info(f"Successfully loaded FAISS index with {index.ntotal} vectors")
             
         except Exception as e:
             logger.error(f"Failed to load FAISS index from {self.index_file}: {e}")
             raise
 
+    def _read_index(self) -> faiss.Index:
+        """
+        Read the index from disk, memory-mapped when the index type supports it.
+        
+        Returns:
+            Loaded FAISS index
+        """
+        if self.mmap:
+            try:
+                return faiss.read_index(self.index_file, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+            except RuntimeError as e:
+                logger.warning(f"mmap load not supported for {self.index_file}, reading into memory: {e}")
+        return faiss.read_index(self.index_file)
+
     def search(self, query: str, top_k: int = DEFAULT_TOP_K) -> List[SearchResult]:
         """
         Search for relevant documents using FAISS vector similarity.
@@ -188,42 +227,38 @@ class FaissSqliteSearcher(BaseSearcher):
             List of search results with metadata
         """
         try:
-            # Connect to database and fetch metadata
-            conn = db_connect(self.db_path)
+            conn = self._conn()
+
+            # Map FAISS IDs to chunk IDs
+            id_map = chunk_ids_for_faiss_ids(conn, faiss_ids)
+            chunk_ids = [id_map.get(fid, "") for fid in faiss_ids if id_map.get(fid)]
             
-            try:
-                # Map FAISS IDs to chunk IDs
-                id_map = chunk_ids_for_faiss_ids(conn, faiss_ids)
-                chunk_ids = [id_map.get(fid, "") for fid in faiss_ids if id_map.get(fid)]
-                
-                if not chunk_ids:
-                    logger.warning("No chunk IDs found for FAISS IDs")
-                    return []
-                
-                # Fetch chunk metadata
-                meta = fetch_chunk_texts(conn, chunk_ids)
-                
-                # Format results
-                hits: List[SearchResult] = []
-                for fid, score in zip(faiss_ids, scores):
-                    cid = id_map.get(fid)
-                    if not cid:
-                        continue
-                        
-                    chunk_meta = meta.get(cid, {})
-                    hits.append({
-                        "chunk_id": cid,
-                        "score": score,
-                        "text": (chunk_meta.get("text") or "")[:DEFAULT_TEXT_PREVIEW_LENGTH],
-                        "path": chunk_meta.get("path", ""),
-                        "section": chunk_meta.get("section", ""),
-                        "source": chunk_meta.get("source", ""),
-                    })
-                
-                return hits
-                
-            finally:
-                conn.close()
+            if not chunk_ids:
+                logger.warning("No chunk IDs found for FAISS IDs")
+                return []
+            
+            # Fetch chunk metadata
+            meta = fetch_chunk_texts(conn, chunk_ids)
+            
+            # Format results
+            hits: List[SearchResult] = []
+            for fid, score in zip(faiss_ids, scores):
+                cid = id_map.get(fid)
+                if not cid:
+                    continue
+                    
+                chunk_meta = meta.get(cid, {})
+                hits.append({
+                    "chunk_id": cid,
+                    "score": score,
+                    # stripped once here so prompt assembly's strip() is a no-op returning the same str
+                    "text": (chunk_meta.get("text") or "")[:DEFAULT_TEXT_PREVIEW_LENGTH].strip(),
+                    "path": chunk_meta.get("path", ""),
+                    "section": chunk_meta.get("section", ""),
+                    "source": chunk_meta.get("source", ""),
+                })
+            
+            return hits
                 
         except Exception as e:
             logger.error(f"Metadata fetching failed: {e}")
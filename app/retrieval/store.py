@@ -6,9 +6,12 @@ from __future__ import annotations
 import sqlite3
 import json
 import logging
+from functools import lru_cache
 from typing import List, Tuple, Dict, Optional
 import numpy as np
 
+from app.embed.store import dtype_column, from_blobs
+
 logger = logging.getLogger(__name__)
 
 # Configuration constants
@@ -16,6 +19,19 @@ DEFAULT_BATCH_SIZE = 999
 DEFAULT_EMBEDDING_DIM = 1
 
 
+@lru_cache(maxsize=64)
+def _in_sql(head: str, n: int) -> str:
+    """Build (and memoize) "<head> IN (?,...)" with n placeholders; equal strings reuse cached statements."""
+    return f"{head} IN ({','.join('?' * n)})"
+
+
+def _tuple_cursor(conn: sqlite3.Connection) -> sqlite3.Cursor:
+    """Cursor returning plain tuples; positional access skips sqlite3.Row's name lookup on hot loops."""
+    cur = conn.cursor()
+    cur.row_factory = None
+    return cur
+
+
 def connect(db_path: str) -> sqlite3.Connection:
     """
     Create a database connection with row factory enabled.
@@ -55,7 +71,7 @@ def load_embeddings(conn: sqlite3.Connection, model: str) -> tuple[list[str], np
     """
     try:
         rows = conn.execute(
-            "SELECT chunk_id, dim, vec FROM embeddings WHERE model = ?",
+            f"SELECT chunk_id, dim, vec, {dtype_column(conn)} FROM embeddings WHERE model = ?",
             (model,)
         ).fetchall()
         
@@ -70,15 +86,8 @@ def load_embeddings(conn: sqlite3.Connection, model: str) -> tuple[list[str], np
                 raise ValueError(f"Inconsistent embedding dimensions: expected {dim}, got {row['dim']}")
 
         # Build matrix
-        ids: list[str] = []
-        vecs: list[np.ndarray] = []
-        
-        for row in rows:
-            ids.append(row["chunk_id"])
-            v = np.frombuffer(row["vec"], dtype=np.float32, count=dim)
-            vecs.append(v)
-            
-        mat = np.vstack(vecs).astype(np.float32, copy=False)
+        ids: list[str] = [row["chunk_id"] for row in rows]
+        mat = from_blobs([row["vec"] for row in rows], dim, [row["dtype"] for row in rows])
         logger.info(f"Loaded {len(ids)} embeddings for model {model} with dimension {dim}")
         return ids, mat
         
@@ -185,11 +194,9 @@ def fetch_full_chunks(conn: sqlite3.Connection, chunk_ids: list[str], batch_size
     try:
         for i in range(0, len(chunk_ids), batch_size):
             batch = chunk_ids[i:i + batch_size]
-            placeholders = ','.join('?' * len(batch))
-            query = f"SELECT id, text FROM chunks WHERE id IN ({placeholders})"
-            
-            for row in conn.execute(query, batch):
-                out[row["id"]] = row["text"] or ""
+            # Full batches share one SQL string, so only the tail is prepared anew
+            query = _in_sql("SELECT id, text FROM chunks WHERE id", len(batch))
+            out.update((row[0], row[1] or "") for row in _tuple_cursor(conn).execute(query, batch))
                 
         logger.debug(f"Fetched full text for {len(out)} chunks")
         return out
@@ -1,7 +1,8 @@
 # app/scripts/add_dataset.py
-import argparse, os, pathlib
+import argparse, os
 from app.retrieval.store import connect
 from app.corpus.chunk import chunk_file
+from app.corpus.files import ScandirFileIterator
 from app.embed.model import Embedder
 
 DB_PATH = "rag_local.db"
@@ -47,16 +48,9 @@ def embed_new(conn, embedder):
 
 def collect_files(paths):
     """Expand files and directories into a flat file list."""
-    all_files = []
-    exts = [".txt", ".pdf", ".md"]
-    for p in paths:
-        path = pathlib.Path(p)
-        if path.is_dir():
-            for ext in exts:
-                all_files.extend(list(path.rglob(f"*{ext}")))
-        elif path.is_file() and path.suffix.lower() in exts:
-            all_files.append(path)
-    return [str(f) for f in all_files]
+    # one scandir pass per tree instead of an rglob walk per extension
+    files = ScandirFileIterator()
+    return [f for p in paths for f in files.iterate_files(p)]
 
 def main():
     ap = argparse.ArgumentParser(description="Add new dataset(s) and rebuild FAISS index.")
@@ -3,6 +3,7 @@ import argparse, json, os, pathlib
 import numpy as np
 import faiss
 from app.corpus.chunk import chunk_file
+from app.corpus.files import ScandirFileIterator
 from app.embed.model import Embedder
 
 MODEL_NAME = "BAAI/bge-small-en-v1.5"
@@ -52,9 +53,7 @@ def main():
     for p in args.paths:
         path = pathlib.Path(p)
         if path.is_dir():
-            files.extend(path.rglob("*.txt"))
-            files.extend(path.rglob("*.md"))
-            files.extend(path.rglob("*.pdf"))
+            files.extend(ScandirFileIterator().iterate_files(p))
         elif path.is_file():
             files.append(path)
 
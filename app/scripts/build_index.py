@@ -2,21 +2,17 @@
 import argparse, json, os
 import numpy as np
 from app.retrieval.store import connect
+from app.embed.store import dtype_column, from_blobs
 from app.vector_store.faiss_store import FaissStore
 from app.vector_store.qdrant_store import QdrantStore
 
 def load_embeddings(conn, model: str):
-    rows = conn.execute("SELECT chunk_id, dim, vec FROM embeddings WHERE model = ?", (model,)).fetchall()
-    ids, vecs = [], []
-    dim = 0
-    for r in rows:
-        ids.append(r["chunk_id"])
-        dim = r["dim"]
-        v = np.frombuffer(r["vec"], dtype=np.float32, count=dim)
-        vecs.append(v)
-    if not vecs:
+    rows = conn.execute(f"SELECT chunk_id, dim, vec, {dtype_column(conn)} FROM embeddings WHERE model = ?", (model,)).fetchall()
+    if not rows:
         return [], np.zeros((0,1), dtype=np.float32), 0
-    mat = np.vstack(vecs).astype(np.float32, copy=False)
+    ids = [r["chunk_id"] for r in rows]
+    dim = rows[-1]["dim"]
+    mat = from_blobs([r["vec"] for r in rows], dim, [r["dtype"] for r in rows])
     # cosine: store normalized
     norm = np.linalg.norm(mat, axis=1, keepdims=True) + 1e-12
     mat = mat / norm
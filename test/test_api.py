@@ -2,14 +2,18 @@ import pytest
 from fastapi.testclient import TestClient
 from app.api import app
 
-client = TestClient(app)
+@pytest.fixture
+def client():
+    # entering the client runs the app's lifespan, which builds app.state
+    with TestClient(app) as c:
+        yield c
 
-def test_healthz():
+def test_healthz(client):
     r = client.get("/healthz")
     assert r.status_code == 200
     assert r.json()["ok"] is True
 
-def test_search_endpoint(tmp_db, monkeypatch):
+def test_search_endpoint(client, tmp_db, monkeypatch):
     monkeypatch.setenv("VECTOR_DB", "sqlite")
     client.app.dependency_overrides = {}
     r = client.post("/search", json={"query":"refund policy","top_k":1})
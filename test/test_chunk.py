@@ -0,0 +1,21 @@
+from app.corpus.chunk import chunk_text, sliding_window_chunks, sliding_window_chunks_soa
+from app.corpus.interfaces import ChunkData
+
+def test_sliding_window_offsets():
+    text = "abcdefghij" * 25  # 250 chars
+    chunks = sliding_window_chunks(text, "intro", max_chars=100, overlap=20)
+    assert [(c.start_char, c.end_char) for c in chunks] == [(0, 100), (80, 180), (160, 250)]
+    assert all(isinstance(c, ChunkData) and c.section == "intro" for c in chunks)
+    assert chunks[1].text == text[80:180]
+
+def test_soa_matches_chunks():
+    text = "x" * 1000
+    soa = sliding_window_chunks_soa(text, None, max_chars=300, overlap=50)
+    chunks = sliding_window_chunks(text, None, max_chars=300, overlap=50)
+    assert soa["text"] == [c.text for c in chunks]
+    assert soa["start_char"] == [c.start_char for c in chunks]
+
+def test_heading_aware_sections():
+    text = "# One\nalpha beta\n# Two\ngamma delta"
+    chunks = chunk_text(text, heading_aware=True, max_chars=200, overlap=10)
+    assert [c.section for c in chunks] == ["One", "Two"]
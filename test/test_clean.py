@@ -0,0 +1,6 @@
+from app.corpus.clean import normalize_text, normalize_text_stream
+
+def test_stream_matches_whole_text():
+    pages = ["Title\r\n\r\n  body\t text ", "", "﻿next\x00 page\r", "   ", "end"]
+    assert "".join(normalize_text_stream(pages)) == normalize_text("\n".join(pages))
+    assert "".join(normalize_text_stream([])) == ""
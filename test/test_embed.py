@@ -0,0 +1,40 @@
+import numpy as np
+
+from app.corpus.schema import connect, init_db
+from app.embed import compute
+from app.embed.store import DTYPE_INT8_SYM, dequantize, encode_vectors, from_blobs
+
+class _FakeEmbedder:
+    def __init__(self, model_name, **kw):
+        pass
+
+    def encode(self, texts, batch_size=64):
+        return np.array([[float(len(t)), 0.0, 1.0] for t in texts], dtype=np.float32)
+
+def test_compute_embeddings_fresh_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(compute, "Embedder", _FakeEmbedder)
+    db = str(tmp_path / "fresh.db")
+    conn = connect(db)
+    init_db(conn)
+    conn.execute("INSERT INTO documents(id) VALUES('d1')")
+    conn.executemany("INSERT INTO chunks(id, doc_id, text) VALUES(?, 'd1', ?)",
+                     [(f"c{i}", f"text {i}") for i in range(10)])
+    conn.commit()
+    conn.close()
+
+    assert compute.compute_embeddings(db, "m", batch_size=4)["embedded"] == 10
+    # unchanged chunks are skipped on the next pass
+    assert compute.compute_embeddings(db, "m", batch_size=4)["embedded"] == 0
+
+    conn = connect(db)
+    row = conn.execute("SELECT dim, vec, dtype, text_sha256 FROM embeddings WHERE chunk_id='c3' AND model='m'").fetchone()
+    assert row["text_sha256"]
+    assert dequantize(row["vec"], row["dim"], row["dtype"]).tolist() == [6.0, 0.0, 1.0]
+    conn.close()
+
+def test_from_blobs_uses_stored_dtype():
+    # at dim 4 an int8-sym blob (4 + 4 bytes) has the float16 length (2 * 4 bytes)
+    vecs = np.array([[1.0, -2.0, 0.5, 4.0], [0.0, 1.0, 0.0, -1.0]], dtype=np.float32)
+    blobs = [r.tobytes() for r in encode_vectors(vecs, DTYPE_INT8_SYM)]
+    mat = from_blobs(blobs, 4, [DTYPE_INT8_SYM] * 2)
+    assert np.allclose(mat, vecs, atol=0.05)
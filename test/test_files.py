@@ -0,0 +1,36 @@
+import os
+
+import pytest
+
+from app.corpus.files import iter_paths, iter_paths_parallel
+
+@pytest.mark.skipif(hasattr(os, "geteuid") and os.geteuid() == 0, reason="root ignores directory permissions")
+def test_iter_paths_skips_unreadable_subdir(tmp_path):
+    (tmp_path / "a.md").write_text("a", encoding="utf-8")
+    locked = tmp_path / "locked"
+    locked.mkdir()
+    (locked / "b.md").write_text("b", encoding="utf-8")
+    locked.chmod(0)
+    try:
+        assert [os.path.basename(e.path) for e in iter_paths(str(tmp_path))] == ["a.md"]
+    finally:
+        locked.chmod(0o755)
+
+def test_iter_paths_missing_root_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        list(iter_paths(str(tmp_path / "missing")))
+
+@pytest.mark.skipif(hasattr(os, "geteuid") and os.geteuid() == 0, reason="root ignores directory permissions")
+def test_iter_paths_parallel_skips_unreadable_subdir(tmp_path):
+    (tmp_path / "a.md").write_text("a", encoding="utf-8")
+    locked = tmp_path / "locked"
+    locked.mkdir()
+    locked.chmod(0)
+    try:
+        assert [os.path.basename(e.path) for e in iter_paths_parallel(str(tmp_path), workers=2)] == ["a.md"]
+    finally:
+        locked.chmod(0o755)
+
+def test_iter_paths_parallel_missing_root_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        list(iter_paths_parallel(str(tmp_path / "missing"), workers=2))
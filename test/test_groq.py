@@ -1,3 +1,4 @@
+import asyncio
 from app.llm.groq_gen import GroqGenerator
 
 class DummyCompletions:
@@ -24,3 +25,18 @@ def test_groq_generate(monkeypatch):
     monkeypatch.setattr(g, "client", DummyClient())
     out = g.generate("What is refund policy?", ["Refunds within 30 days."])
     assert "Mock answer" in out
+
+
+class DummyAsyncCompletions:
+    async def create(self, **kwargs):
+        return DummyCompletions().create(**kwargs)
+
+class DummyAsyncClient:
+    def __init__(self):
+        self.chat = type("Chat", (), {"completions": DummyAsyncCompletions()})()
+
+def test_groq_agenerate(monkeypatch):
+    g = GroqGenerator(model="llama-3.1-8b-instant", api_key="dummy")
+    monkeypatch.setattr(g, "_aclient", DummyAsyncClient())
+    out = asyncio.run(g.agenerate("What is refund policy?", ["Refunds within 30 days."]))
+    assert "Mock answer" in out
@@ -1,4 +1,5 @@
 from app.retrieval.store import connect, fetch_chunk_texts, load_embeddings
+from app.corpus import ingest_path
 
 def test_embeddings_roundtrip(tmp_db):
     conn = connect(tmp_db)
@@ -7,3 +8,23 @@ def test_embeddings_roundtrip(tmp_db):
     assert mat.shape == (1, 384)
     chunks = fetch_chunk_texts(conn, ["chunk1"])
     assert "refund" in chunks["chunk1"]["text"].lower()
+
+def test_ingest_skips_unchanged_files(tmp_path):
+    data = tmp_path / "data"
+    data.mkdir()
+    (data / "a.md").write_text("# Refunds\n" + "Refunds are allowed within 30 days. " * 60, encoding="utf-8")
+    (data / "b.txt").write_text("Shipping takes five business days.", encoding="utf-8")
+    db = str(tmp_path / "rag.db")
+
+    stats = ingest_path(str(data), db_path=db, workers=1)
+    assert stats["documents"] == 2 and stats["chunks"] > 2 and not stats["skipped_files"]
+
+    conn = connect(db)
+    n_chunks = conn.execute("SELECT count(*) FROM chunks").fetchone()[0]
+    assert n_chunks == stats["chunks"]
+    assert conn.execute("SELECT count(*) FROM chunks WHERE text_sha256 IS NULL").fetchone()[0] == 0
+    conn.close()
+
+    # a second pass finds both files in the hash cache and parses nothing
+    again = ingest_path(str(data), db_path=db, workers=1)
+    assert again["documents"] == 0 and len(again["unchanged_files"]) == 2